@@ -1,6 +1,7 @@
 import random
 import arcade
 import math
+from trails import TRAIL_DECAY_RATE, TrailBands, TrailStore, trail_capacity
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -11,8 +12,16 @@ NEST_COLOR = arcade.color.BROWN
 ANT_COLOR = arcade.color.BLACK
 LOOKING_FOR_FOOD_COLOR = arcade.color.BLUE
 FOUND_FOOD_COLOR = arcade.color.ORANGE
-TRAIL_DECAY_RATE = 0.0005
 ANT_SIZE = 5
+ANTS_COUNT = 10
+# Trail point kinds and their colours at full strength
+LOOKING_FOR_FOOD, FOUND_FOOD = 0, 1
+TRAIL_COLORS = (LOOKING_FOR_FOOD_COLOR, FOUND_FOOD_COLOR)
+# Trails are drawn in this many brightness steps, one draw_points per step
+TRAIL_SHADES = 16
+# Cell size of the trail-tip hash; at least the largest ant-to-tip
+# collision distance, so a 3x3 block of cells holds every reachable tip
+TIP_CELL_SIZE = 8
 
 
 def check_for_collision(circle1, circle2):
@@ -49,7 +58,7 @@ class Food:
 
 
 class Ant(arcade.Sprite):
-    def __init__(self, nest):
+    def __init__(self, nest, trails):
         super().__init__()
         self.center_x = nest.center_x
         self.center_y = nest.center_y
@@ -58,7 +67,11 @@ class Ant(arcade.Sprite):
         self.color = ANT_COLOR
         self.direction = random.uniform(0, 2 * 3.141592653589793)
         self.speed = 3
-        self.trail = []
+        self.nest = nest
+        self.trails = trails
+        # last point this ant left; None while it searches until its next
+        # step, set to where it picked up food when it starts carrying
+        self.tip = None
         self.found_food = False
 
     def update(self):
@@ -76,47 +89,129 @@ class Ant(arcade.Sprite):
             SCREEN_WIDTH - ANT_SIZE, self.center_x))
         self.center_y = max(ANT_SIZE, min(
             SCREEN_HEIGHT - ANT_SIZE, self.center_y))
-        self.leave_trail(LOOKING_FOR_FOOD_COLOR)
+        self.leave_trail(LOOKING_FOR_FOOD)
 
     def follow_trail(self):
-        if self.trail:
-            self.direction = math.atan2(
-                self.trail[-1][1] - self.center_y, self.trail[-1][0] - self.center_x)
-            self.center_x += self.speed * math.cos(self.direction)
-            self.center_y += self.speed * math.sin(self.direction)
-            self.center_x = max(ANT_SIZE, min(
-                SCREEN_WIDTH - ANT_SIZE, self.center_x))
-            self.center_y = max(ANT_SIZE, min(
-                SCREEN_HEIGHT - ANT_SIZE, self.center_y))
-            self.leave_trail(FOUND_FOOD_COLOR)
-
-    def leave_trail(self, color):
-        self.trail.append((self.center_x, self.center_y, color))
-
-        # Decay old parts of the trail
-        i = 0
-        while i < len(self.trail):
-            x, y, c = self.trail[i]
-            new_c = (
-                max(0, int(c[0] * (1 - TRAIL_DECAY_RATE))),
-                max(0, int(c[1] * (1 - TRAIL_DECAY_RATE))),
-                max(0, int(c[2] * (1 - TRAIL_DECAY_RATE))),
-            )
-            self.trail[i] = (x, y, new_c)
-            if sum(new_c) < 0.1:
-                self.trail.pop(i)
-            else:
-                i += 1
+        # carry the food home, leaving a trail other ants can pick up
+        self.direction = math.atan2(self.nest.center_y - self.center_y,
+                                    self.nest.center_x - self.center_x)
+        self.center_x += self.speed * math.cos(self.direction)
+        self.center_y += self.speed * math.sin(self.direction)
+        self.center_x = max(ANT_SIZE, min(
+            SCREEN_WIDTH - ANT_SIZE, self.center_x))
+        self.center_y = max(ANT_SIZE, min(
+            SCREEN_HEIGHT - ANT_SIZE, self.center_y))
+        self.leave_trail(FOUND_FOOD)
+
+    def leave_trail(self, kind):
+        # the point fades with its age in the shared store; nothing is
+        # rewritten per step
+        self.trails.deposit(self.center_x, self.center_y, kind)
+        self.tip = (self.center_x, self.center_y)
 
     def draw(self):
         arcade.draw_circle_filled(
             self.center_x, self.center_y, self.width/2, self.color)
 
 
+def draw_trails(bands):
+    """
+    Draw every live trail point, faded by its age.
+
+    Points are grouped by kind and strength band, so the whole store takes
+    at most ``len(TRAIL_COLORS) * TRAIL_SHADES`` draw calls. ``bands`` keeps
+    the groups between frames and only moves the points that changed band.
+    """
+    for shade, lists in enumerate(bands.update()):
+        level = (shade + 1) / TRAIL_SHADES
+        for color, points in zip(TRAIL_COLORS, lists):
+            if points:
+                arcade.draw_points(
+                    points, tuple(int(c * level) for c in color[:3]),
+                    ANT_SIZE)
+
+
+class TrailTip:
+    """The newest point of a food-carrying ant's trail."""
+
+    __slots__ = ("center_x", "center_y", "width", "ant")
+
+    def __init__(self, ant):
+        self.center_x, self.center_y = ant.tip
+        self.width = ANT_SIZE
+        self.ant = ant
+
+
+class TipHash:
+    """
+    Per-frame uniform grid of the trail tips of food-carrying ants.
+
+    Rebuilt once per frame in O(N); an ant then tests only the tips in the
+    3x3 cells around it instead of every other ant.
+    """
+
+    def __init__(self, cell_size=TIP_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def build(self, ants):
+        self.cells.clear()
+        for ant in ants:
+            if ant.found_food and ant.tip is not None:
+                tip = TrailTip(ant)
+                key = (int(tip.center_x // self.cell_size),
+                       int(tip.center_y // self.cell_size))
+                self.cells.setdefault(key, []).append(tip)
+
+    def nearby(self, x, y):
+        ix = int(x // self.cell_size)
+        iy = int(y // self.cell_size)
+        for cx in (ix - 1, ix, ix + 1):
+            for cy in (iy - 1, iy, iy + 1):
+                yield from self.cells.get((cx, cy), ())
+
+
+def update_ants(ants, food_list, nest, tips):
+    """
+    Switch ants between searching and carrying after they moved.
+
+    A searching ant starts carrying when it touches food or the trail tip
+    of a carrying ant, and a carrying ant drops its load at the nest.
+    """
+    tips.build(ants)
+    for ant in ants:
+        if ant.found_food:
+            continue
+        for food in food_list:
+            if check_for_collision(ant, food):
+                break
+        else:
+            for tip in tips.nearby(ant.center_x, ant.center_y):
+                if tip.ant is not ant and check_for_collision(ant, tip):
+                    break
+            else:
+                continue
+        ant.found_food = True
+        # the pickup point is the start of the new trail, so the ant
+        # recruits others from this frame on
+        ant.tip = (ant.center_x, ant.center_y)
+        ant.color = FOUND_FOOD_COLOR
+    for ant in ants:
+        if ant.found_food and check_for_collision(ant, nest):
+            ant.found_food = False
+            ant.tip = None
+            ant.color = ANT_COLOR
+
+
 class MyGame(arcade.Window):
     def __init__(self, width, height):
         super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, "Ants")
         self.ant_list = arcade.SpriteList()
+        self.trails = TrailStore(
+            trail_capacity(ANTS_COUNT, TRAIL_DECAY_RATE), TRAIL_DECAY_RATE)
+        self.trail_bands = TrailBands(self.trails, TRAIL_SHADES,
+                                      len(TRAIL_COLORS))
+        self.tips = TipHash()
         self.nest = Nest()
 
         self.food_list = []
@@ -127,8 +222,8 @@ class MyGame(arcade.Window):
                 food = Food()
             self.food_list.append(food)
 
-        for _ in range(10):
-            ant = Ant(self.nest)
+        for _ in range(ANTS_COUNT):
+            ant = Ant(self.nest, self.trails)
             self.ant_list.append(ant)
 
     def setup(self):
@@ -142,42 +237,21 @@ class MyGame(arcade.Window):
         for food in self.food_list:
             food.draw()
 
-        for ant in self.ant_list:
-            for x, y, color in ant.trail:
-                arcade.draw_circle_filled(x, y, ANT_SIZE / 2, color)
+        draw_trails(self.trail_bands)
 
+        # one batched draw_points call per ant colour instead of one
+        # draw_circle_filled per ant
+        ants_by_color = {}
         for ant in self.ant_list:
-            ant.draw()
+            ants_by_color.setdefault(tuple(ant.color), []).append(
+                (ant.center_x, ant.center_y))
+        for color, points in ants_by_color.items():
+            arcade.draw_points(points, color, 2)
 
     def update(self, delta_time):
-        self.all_sprites_list.update()
-        for ant in self.ant_list:
-            if not ant.found_food:
-                for food in self.food_list:
-                    if arcade.check_for_collision(ant, food):
-                        ant.found_food = True
-                        ant.trail = []
-                        ant.color = FOUND_FOOD_COLOR
-                        break
-                else:
-                    for other_ant in self.ant_list:
-                        if (
-                            other_ant != ant
-                            and other_ant.found_food
-                            and other_ant.trail
-                            and arcade.check_for_collision(
-                                ant, other_ant.trail[-1][3]
-                            )
-                        ):
-                            ant.found_food = True
-                            ant.trail = []
-                            ant.color = FOUND_FOOD_COLOR
-                            break
-        for ant in self.ant_list:
-            if ant.found_food and arcade.check_for_collision(ant, self.nest):
-                ant.found_food = False
-                ant.trail = []
-                ant.color = ANT_COLOR
+        self.trails.advance()
+        self.ant_list.update()
+        update_ants(self.ant_list, self.food_list, self.nest, self.tips)
 
 
 def main():
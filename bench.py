@@ -0,0 +1,273 @@
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+
+# Globals
+# General
+HERE = os.path.dirname(os.path.abspath(__file__))
+VARIANTS = ("colony", "PyAnts", "newest", "newgpt", "pyants2", "PyAntsArcade")
+ANT_COUNTS = (100, 1_000, 10_000, 100_000)
+SIZES = ((800, 600), (2000, 1000))
+TICKS = 100
+SEED = 0
+# Per-run wall time budget; slow variants stop early and report what they ran
+MAX_SECONDS = 60
+
+
+def _load_pyants():
+    """Import the extension-less ``PyAnts`` script as a module."""
+    loader = importlib.machinery.SourceFileLoader(
+        "PyAnts", os.path.join(HERE, "PyAnts"))
+    spec = importlib.util.spec_from_loader("PyAnts", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def _colony(ants_count, size, seed):
+    from config import SimConfig, build_world
+
+    return build_world(SimConfig(size=size, ants_count=ants_count,
+                                 seed=seed)).step
+
+
+def _pyants(ants_count, size, seed):
+    pyants = _load_pyants()
+    pyants.setup(pyants.default_config(size=size, ants_count=ants_count,
+                                       seed=seed), render=False)
+    return pyants.step
+
+
+def _newest(ants_count, size, seed):
+    import newest
+
+    newest.WIDTH, newest.HEIGHT = size
+    newest.N_ANT = ants_count
+    return newest.App(headless=True, seed=seed).update
+
+
+def _newgpt(ants_count, size, seed):
+    import pygame
+    import newgpt
+
+    newgpt.SCREEN = size
+    newgpt.nest = newgpt.Nest(size[0] // 2, size[1] // 2)
+    food_sources = [newgpt.FoodSource(random.randint(100, size[0] - 100),
+                                      random.randint(100, size[1] - 100))
+                    for _ in range(newgpt.FOOD_SOURCE_COUNT)]
+    quadtree = newgpt.Quadtree(0, 0, size[0], size[1], 4, 4)
+    for food in food_sources:
+        quadtree.insert(food, pygame.Rect(
+            food.x - food.radius, food.y - food.radius,
+            2 * food.radius, 2 * food.radius))
+    ants = [newgpt.Ant(newgpt.nest.x, newgpt.nest.y)
+            for _ in range(ants_count)]
+    pheromone_grid = newgpt.PheromoneGrid(
+        size[0], size[1], newgpt.PHEROMONE_SIZE)
+
+    def step():
+        for ant in ants:
+            ant.update(food_sources, pheromone_grid, quadtree)
+        pheromone_grid.evaporate(newgpt.PHEROMONE_DECAY_RATE)
+    return step
+
+
+def _pyants2(ants_count, size, seed):
+    import pygame
+    import pyants2
+
+    pyants2.SCREEN_WIDTH, pyants2.SCREEN_HEIGHT = size
+    pyants2.pheromone_grid = np.zeros(
+        (size[0] // pyants2.PHEROMONE_SIZE, size[1] // pyants2.PHEROMONE_SIZE))
+    ants = pygame.sprite.Group(
+        pyants2.Ant((random.randint(0, size[0]), random.randint(0, size[1])))
+        for _ in range(ants_count))
+    return ants.update
+
+
+def _pyants_arcade(ants_count, size, seed):
+    import PyAntsArcade
+    from trails import TRAIL_DECAY_RATE, TrailStore, trail_capacity
+
+    PyAntsArcade.SCREEN_WIDTH, PyAntsArcade.SCREEN_HEIGHT = size
+    nest = PyAntsArcade.Nest()
+    food_list = [PyAntsArcade.Food() for _ in range(5)]
+    trails = TrailStore(trail_capacity(ants_count, TRAIL_DECAY_RATE),
+                        TRAIL_DECAY_RATE)
+    ants = [PyAntsArcade.Ant(nest, trails) for _ in range(ants_count)]
+    tips = PyAntsArcade.TipHash()
+
+    def step():
+        trails.advance()
+        for ant in ants:
+            ant.update()
+        PyAntsArcade.update_ants(ants, food_list, nest, tips)
+    return step
+
+
+ADAPTERS = {
+    "colony": _colony,
+    "PyAnts": _pyants,
+    "newest": _newest,
+    "newgpt": _newgpt,
+    "pyants2": _pyants2,
+    "PyAntsArcade": _pyants_arcade,
+}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_one(variant: str, ants_count: int, size, ticks: int = TICKS,
+            seed: int = SEED, max_seconds: float = MAX_SECONDS) -> dict:
+    """
+    Build one variant headless and time its ticks in this process.
+
+    Parameters
+    ----------
+    variant : str
+        One of ``VARIANTS``.
+    ants_count : int
+        Number of ants.
+    size : tuple[int, int]
+        Width and height of the world.
+    ticks : int
+        Number of ticks to run.
+    seed : int
+        Seed of the variant's own generator; variants without one are
+        seeded through ``random`` and ``np.random``.
+    max_seconds : float
+        Stop early once this much wall time has been spent ticking.
+
+    Returns
+    -------
+    dict
+        One result record.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    random.seed(seed)
+    np.random.seed(seed)
+
+    start = time.perf_counter()
+    step = ADAPTERS[variant](ants_count, size, seed)
+    setup_seconds = time.perf_counter() - start
+
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < ticks and time.perf_counter() - start < max_seconds:
+        tick_start = time.perf_counter()
+        step()
+        latencies.append(time.perf_counter() - tick_start)
+    seconds = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(ms, (50, 90, 99))
+    return {
+        "variant": variant,
+        "ants": ants_count,
+        "size": list(size),
+        "seed": seed,
+        "ticks": len(latencies),
+        "setup_seconds": setup_seconds,
+        "ticks_per_second": len(latencies) / seconds,
+        "latency_ms": {"p50": p50, "p90": p90, "p99": p99,
+                       "max": float(ms.max())},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_suite(variants=VARIANTS, ant_counts=ANT_COUNTS, sizes=SIZES,
+              ticks: int = TICKS, seed: int = SEED,
+              max_seconds: float = MAX_SECONDS) -> list:
+    """
+    Sweep variants, ant counts and world sizes, one subprocess per run.
+
+    Every run gets a fresh interpreter so module globals and peak RSS do not
+    leak between runs. Runs that fail (missing dependency, crash, timeout)
+    are recorded with an ``error`` instead of aborting the sweep.
+
+    Returns
+    -------
+    list[dict]
+        One result record per run.
+    """
+    results = []
+    for variant in variants:
+        for size in sizes:
+            for ants_count in ant_counts:
+                cmd = [sys.executable, os.path.abspath(__file__), "--worker",
+                       variant, str(ants_count), f"{size[0]}x{size[1]}",
+                       "--ticks", str(ticks), "--seed", str(seed),
+                       "--max-seconds", str(max_seconds)]
+                record = {"variant": variant, "ants": ants_count,
+                          "size": list(size), "seed": seed}
+                try:
+                    proc = subprocess.run(
+                        cmd, capture_output=True, text=True, cwd=HERE,
+                        timeout=max_seconds * 5 + 60)
+                except subprocess.TimeoutExpired:
+                    record["error"] = "timeout"
+                else:
+                    if proc.returncode == 0:
+                        record = json.loads(proc.stdout.splitlines()[-1])
+                    else:
+                        lines = proc.stderr.strip().splitlines()
+                        record["error"] = lines[-1] if lines else \
+                            f"exit code {proc.returncode}"
+                print(json.dumps(record), file=sys.stderr)
+                results.append(record)
+    return results
+
+
+def _size(text: str):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the simulation variants headless.")
+    parser.add_argument("--variants", nargs="+", default=VARIANTS,
+                        choices=VARIANTS)
+    parser.add_argument("--ants", nargs="+", type=int, default=ANT_COUNTS)
+    parser.add_argument("--sizes", nargs="+", type=_size, default=SIZES,
+                        metavar="WxH")
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--worker", nargs=3,
+                        metavar=("VARIANT", "ANTS", "WxH"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        variant, ants_count, size = args.worker
+        print(json.dumps(run_one(variant, int(ants_count), _size(size),
+                                 args.ticks, args.seed, args.max_seconds)))
+        return
+
+    results = run_suite(args.variants, args.ants, args.sizes, args.ticks,
+                        args.seed, args.max_seconds)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
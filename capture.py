@@ -0,0 +1,151 @@
+import argparse
+import os
+import queue
+import threading
+import numpy as np
+import pygame
+
+# Globals
+# Frames buffered between the simulation and the writer thread
+RING_SLOTS = 32
+CAPTURE_FORMATS = ("raw", "png")
+RAW_FILE = "frames.rgb"
+
+
+def parse_record_path(argv=None):
+    """
+    Read ``--record DIR`` from the command line.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        Arguments to parse, ``sys.argv[1:]`` when omitted.
+
+    Returns
+    -------
+    str | None
+        Directory to record frames into, or None to not record.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--record", metavar="DIR")
+    args, _ = parser.parse_known_args(argv)
+    return args.record
+
+
+class FrameRecorder:
+    """
+    Non-blocking frame capture.
+
+    ``capture`` copies the rendered surface into a free slot of a
+    preallocated ring buffer and returns; a background thread writes full
+    slots to disk and hands them back. When every slot is still waiting to
+    be written the frame is dropped and counted instead of stalling the
+    simulation.
+
+    Frames are written either as one raw RGB24 stream (``frames.rgb``,
+    row-major, e.g. for ``ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH``) or as
+    a numbered PNG sequence.
+    """
+
+    def __init__(self, path: str, size, slots: int = RING_SLOTS,
+                 fmt: str = "raw"):
+        """
+        Initialize a FrameRecorder and start its writer thread.
+
+        Parameters
+        ----------
+        path : str
+            Output directory; created if missing.
+        size : tuple[int, int]
+            Width and height of the captured surface.
+        slots : int
+            Number of frames the ring buffer holds.
+        fmt : str
+            One of ``CAPTURE_FORMATS``.
+        """
+        if fmt not in CAPTURE_FORMATS:
+            raise ValueError(f"fmt must be one of {CAPTURE_FORMATS}, "
+                             f"not {fmt!r}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.size = size
+        self.fmt = fmt
+        # slots hold mapped 32-bit pixels, (height, width) so the copy out of
+        # the surface is close to a memcpy; the writer unpacks them to RGB
+        self.ring = np.empty((slots, size[1], size[0]), dtype=np.uint32)
+        self.shifts = None
+        self.free = queue.SimpleQueue()
+        for slot in range(slots):
+            self.free.put(slot)
+        self.full = queue.SimpleQueue()
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def capture(self, surface: pygame.Surface) -> bool:
+        """
+        Queue a copy of the surface for writing.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The rendered frame, of the recorder's size.
+
+        Returns
+        -------
+        bool
+            False if the frame was dropped because the writer is behind.
+        """
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        if self.shifts is None:
+            self.shifts = surface.get_shifts()[:3]
+        if surface.get_bytesize() == 4:
+            pixels = pygame.surfarray.pixels2d(surface)
+            np.copyto(self.ring[slot], pixels.T)
+            del pixels  # unlock the surface
+        else:
+            np.copyto(self.ring[slot], pygame.surfarray.array2d(surface).T,
+                      casting="unsafe")
+        self.full.put((slot, self.captured))
+        self.captured += 1
+        return True
+
+    def _write(self):
+        raw = open(os.path.join(self.path, RAW_FILE), "wb") \
+            if self.fmt == "raw" else None
+        rgb = np.empty(self.ring.shape[1:] + (3,), dtype=np.uint8)
+        channel = np.empty(self.ring.shape[1:], dtype=np.uint32)
+        try:
+            while True:
+                item = self.full.get()
+                if item is None:
+                    break
+                slot, index = item
+                for plane, shift in enumerate(self.shifts):
+                    np.right_shift(self.ring[slot], shift, out=channel)
+                    rgb[..., plane] = channel  # keeps the low byte
+                self.free.put(slot)
+                if raw is not None:
+                    raw.write(rgb.data)
+                else:
+                    image = pygame.image.frombuffer(rgb.data, self.size,
+                                                    "RGB")
+                    pygame.image.save(image, os.path.join(
+                        self.path, f"frame_{index:06d}.png"))
+                self.written += 1
+        finally:
+            if raw is not None:
+                raw.close()
+
+    def close(self):
+        """
+        Write the queued frames and stop the writer thread.
+        """
+        self.full.put(None)
+        self.thread.join()
@@ -0,0 +1,219 @@
+import json
+import os
+import numpy as np
+from colony import ANT_FIELDS, Colony
+from obstacles import ObstacleMap
+from pheromones import PheromoneGrid
+
+# Globals
+VERSION = 1
+META_FILE = "meta.json"
+# PheromoneGrid arrays stored next to the ant arrays
+GRID_ARRAYS = ("grid_nest", "grid_food", "active_nest", "active_food")
+
+
+def _save_array(path: str, name: str, array):
+    """
+    Write ``name.npy`` under a temporary name and move it into place.
+
+    A run resumed from ``path`` still maps the old files; replacing them
+    leaves those mappings intact instead of truncating the file they read.
+    """
+    file = os.path.join(path, f"{name}.npy")
+    temporary = file + ".tmp"
+    with open(temporary, "wb") as f:
+        np.save(f, array)
+    os.replace(temporary, file)
+
+
+def save(path: str, ants: dict, pheromone_grid: PheromoneGrid, food,
+         nest, tick: int = 0, delivered: int = 0, rng=None,
+         obstacles: ObstacleMap | None = None, motion: dict | None = None):
+    """
+    Write a checkpoint directory.
+
+    Every array goes to its own ``.npy`` file so restores can map them;
+    ``meta.json`` holds everything else and is written last, so a directory
+    without it is an incomplete checkpoint. Every file is written to a
+    temporary name first, so ``path`` may be the checkpoint the run was
+    resumed from.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory; created if missing, overwritten if present.
+    ants : dict[str, np.ndarray]
+        One array per name in ``colony.ANT_FIELDS``.
+    pheromone_grid : PheromoneGrid
+        The pheromone grid.
+    food : tuple[np.ndarray, ...]
+        Food centers and radii, plus remaining quantities if finite.
+    nest : tuple[float, float, float]
+        Nest x, y and radius.
+    tick : int
+        Number of ticks simulated so far.
+    delivered : int
+        Food delivered so far.
+    rng : np.random.Generator | None
+        Generator whose state is saved so a resumed run continues the same
+        random stream.
+    obstacles : ObstacleMap | None
+        Walls of the world.
+    motion : dict | None
+        Ant ``speed``, ``turn_rate`` and ``rnd_rate`` the run used.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name in ANT_FIELDS:
+        _save_array(path, name, ants[name])
+    for name in GRID_ARRAYS:
+        _save_array(path, name, getattr(pheromone_grid, name))
+    _save_array(path, "food_xy", food[0])
+    _save_array(path, "food_radius", food[1])
+    optional = {
+        "food_quantity": food[2] if len(food) > 2 else None,
+        "obstacles": None if obstacles is None else obstacles.blocked,
+    }
+    for name, array in optional.items():
+        file = os.path.join(path, f"{name}.npy")
+        if array is not None:
+            _save_array(path, name, array)
+        elif os.path.exists(file):
+            os.remove(file)
+    meta = {
+        "version": VERSION,
+        "tick": tick,
+        "delivered": delivered,
+        "size": list(pheromone_grid.size),
+        "cell_size": pheromone_grid.cell_size,
+        "dtype": pheromone_grid.dtype.name,
+        "nest_keep": float(pheromone_grid.nest_keep),
+        "food_keep": float(pheromone_grid.food_keep),
+        "diffusion": float(pheromone_grid.diffusion),
+        "nest": list(nest),
+        "rng": rng.bit_generator.state if rng is not None else None,
+        "motion": dict(motion or {}),
+    }
+    temporary = os.path.join(path, META_FILE + ".tmp")
+    with open(temporary, "w") as f:
+        json.dump(meta, f)
+    os.replace(temporary, os.path.join(path, META_FILE))
+
+
+def load(path: str, render: bool = True) -> dict:
+    """
+    Open a checkpoint directory.
+
+    The pheromone grids are memory-mapped copy-on-write: pages are read
+    from disk only when the simulation touches them, and changes never
+    reach the file. Pheromone surfaces start empty; every non-zero cell lies
+    in an active tile, so the first ``PheromoneGrid.update`` redraws them.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory written by ``save``.
+    render : bool
+        Create the pheromone surfaces for drawing.
+
+    Returns
+    -------
+    dict
+        ``tick``, ``delivered``, ``size``, ``nest``, ``ants`` (mapped
+        arrays, read-only), ``food`` (centers, radii and, if saved,
+        quantities), ``pheromone_grid``, ``rng`` (a Generator, or None
+        if none was saved), ``obstacles`` (an ObstacleMap or None) and
+        ``motion`` (the saved ant parameters, empty if none were saved).
+    """
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta["version"] != VERSION:
+        raise ValueError(f"unsupported checkpoint version {meta['version']}")
+
+    def array(name, mode="r"):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+
+    size = tuple(meta["size"])
+    pheromone_grid = PheromoneGrid(size, render=render,
+                                   cell_size=meta["cell_size"],
+                                   dtype=meta["dtype"],
+                                   diffusion=meta.get("diffusion", 0.0))
+    pheromone_grid.nest_keep = np.float32(meta["nest_keep"])
+    pheromone_grid.food_keep = np.float32(meta["food_keep"])
+    for name in GRID_ARRAYS:
+        setattr(pheromone_grid, name, array(name, "c"))
+
+    obstacles = None
+    if os.path.exists(os.path.join(path, "obstacles.npy")):
+        obstacles = ObstacleMap(np.load(os.path.join(path, "obstacles.npy")))
+        pheromone_grid.set_obstacles(
+            obstacles.cells(pheromone_grid.cell_size))
+
+    rng = None
+    if meta["rng"] is not None:
+        rng = np.random.default_rng()
+        rng.bit_generator.state = meta["rng"]
+    food = (np.load(os.path.join(path, "food_xy.npy")),
+            np.load(os.path.join(path, "food_radius.npy")))
+    if os.path.exists(os.path.join(path, "food_quantity.npy")):
+        food += (np.load(os.path.join(path, "food_quantity.npy")),)
+    return {
+        "tick": meta["tick"],
+        "delivered": meta["delivered"],
+        "size": size,
+        "nest": tuple(meta["nest"]),
+        "ants": {name: array(name) for name in ANT_FIELDS},
+        "food": food,
+        "pheromone_grid": pheromone_grid,
+        "rng": rng,
+        "obstacles": obstacles,
+        "motion": meta.get("motion", {}),
+    }
+
+
+def save_colony(path: str, colony: Colony, pheromone_grid: PheromoneGrid,
+                food, tick: int = 0):
+    """
+    Checkpoint a ``Colony`` run.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory.
+    colony : Colony
+        The colony.
+    pheromone_grid : PheromoneGrid
+        The pheromone grid.
+    food : tuple[np.ndarray, ...]
+        Food centers and radii, plus remaining quantities if finite; see
+        ``FoodRaster.food``.
+    tick : int
+        Number of ticks simulated so far.
+    """
+    save(path, {name: getattr(colony, name) for name in ANT_FIELDS},
+         pheromone_grid, food,
+         (colony.nest_x, colony.nest_y, colony.nest_radius), tick,
+         colony.delivered, colony.rng, colony.obstacles,
+         {"speed": colony.speed, "turn_rate": colony.turn_rate,
+          "rnd_rate": colony.rnd_rate})
+
+
+def load_colony(path: str, render: bool = True):
+    """
+    Restore a ``Colony`` run from a checkpoint.
+
+    The ants continue with the speed, turn rate and random rate they were
+    saved with; checkpoints without them fall back to the defaults.
+
+    Returns
+    -------
+    tuple[Colony, PheromoneGrid, tuple[np.ndarray, ...], int]
+        The colony, pheromone grid, food sources and tick count.
+    """
+    state = load(path, render)
+    nest_x, nest_y, nest_radius = state["nest"]
+    colony = Colony(0, nest_x, nest_y, nest_radius, state["size"],
+                    state["rng"], obstacles=state["obstacles"],
+                    **state["motion"])
+    colony.add(state["ants"])
+    colony.delivered = state["delivered"]
+    return colony, state["pheromone_grid"], state["food"], state["tick"]
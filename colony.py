@@ -0,0 +1,380 @@
+import math
+import numpy as np
+import pygame
+from homing import FIELD_CELL_SIZE, NestField
+from loop import SimulationLoop
+from obstacles import ObstacleMap, load_obstacles, parse_obstacles_path
+from pheromones import GRID_SIZE, PheromoneGrid
+from render import AntSprites, Renderer
+from sensing import Sensors
+from spatial import FoodRaster, SpatialHash
+
+# Globals
+# General
+SCREEN = (2000, 1000)
+FPS = 60
+# Nest settings
+NEST_RADIUS = 40
+# Food source settings
+FOOD_SOURCE_COUNT = 5
+FOOD_SOURCE_RADIUS = 15
+# Units of food per source, None for sources that never run out
+FOOD_SOURCE_QUANTITY = None
+# Redraws of food sources that landed in a wall before giving up
+FOOD_PLACEMENT_TRIES = 100
+# Ant settings
+ANTS_COUNT = 100_000
+ANT_SPEED = 5
+ANT_TURN_RATE = 0.1
+ANT_RND_RATE = 0.2
+ANT_COLOR = (255, 255, 255)
+ANT_FOOD_COLOR = (255, 255, 0)
+ANT_RADIUS = 1
+# Ant modes (index into MODE_NAMES for the strings used by PyAnts.Ant)
+LOOKING_FOR_FOOD = 0
+RETURNING_HOME = 1
+MODE_NAMES = ("looking_for_food", "got_food_trying_to_return_home")
+# Per-ant arrays of a Colony, in the order they are handed between workers
+ANT_FIELDS = ("x", "y", "angle", "desired_angle", "mode", "carrying_food",
+              "wall")
+
+
+class Colony:
+    """
+    Struct-of-arrays colony: every ant attribute of ``PyAnts.Ant`` lives in
+    one NumPy array and all ants are advanced by a single batched step.
+
+    ``PyAnts.Ant`` stays the reference implementation; this engine follows
+    the same order of operations (food detection, movement, wall bounce,
+    turning, deposit, nest detection, steering) without per-ant Python code.
+    Steering of searching ants comes from cone sensors sampling the food
+    pheromone ahead of each ant (see ``sensing.Sensors``).
+    """
+
+    def __init__(self, count: int, nest_x: float, nest_y: float,
+                 nest_radius: float = NEST_RADIUS, size=SCREEN, rng=None,
+                 speed: float = ANT_SPEED, turn_rate: float = ANT_TURN_RATE,
+                 rnd_rate: float = ANT_RND_RATE,
+                 obstacles: ObstacleMap | None = None):
+        """
+        Initialize a Colony with all ants sitting on the nest.
+
+        Parameters
+        ----------
+        count : int
+            Number of ants.
+        nest_x : float
+            The x-coordinate of the nest.
+        nest_y : float
+            The y-coordinate of the nest.
+        nest_radius : float
+            The radius of the nest.
+        size : tuple[int, int]
+            Width and height of the world.
+        rng : np.random.Generator | int | None
+            Generator for all of this colony's noise, or a seed for a new
+            one. Runs with the same seed are identical.
+        speed : float
+            Distance an ant moves per tick.
+        turn_rate : float
+            Fraction of the way to the desired angle turned per tick.
+        rnd_rate : float
+            Maximum random change of heading per tick.
+        obstacles : ObstacleMap | None
+            Walls the ants bounce off like off the world's edge, and that
+            returning ants route around. Walls should be thicker than
+            ``speed``, or ants may step across them. The nest must not lie
+            in a wall; a ValueError is raised if it does.
+        """
+        if obstacles is not None and not obstacles.free(
+                np.array([nest_x]), np.array([nest_y]))[0]:
+            raise ValueError(f"nest at ({nest_x}, {nest_y}) is inside a "
+                             f"wall or outside the world")
+        self.rng = np.random.default_rng(rng)
+        self.speed = speed
+        self.turn_rate = turn_rate
+        self.rnd_rate = rnd_rate
+        self.count = count
+        self.size = size
+        self.nest_x = nest_x
+        self.nest_y = nest_y
+        self.nest_radius = nest_radius
+        self.obstacles = obstacles
+        self.x = np.full(count, nest_x, dtype=np.float32)
+        self.y = np.full(count, nest_y, dtype=np.float32)
+        self.angle = self._noise(count, math.pi)
+        self.angle += math.pi
+        self.desired_angle = self.angle + self._noise(count, turn_rate)
+        self.mode = np.full(count, LOOKING_FOR_FOOD, dtype=np.uint8)
+        self.carrying_food = np.zeros(count, dtype=bool)
+        self.wall = np.zeros(count, dtype=bool)
+        self.delivered = 0
+        self.sensors = Sensors(obstacles=obstacles)
+        self.homing = NestField(
+            size, (nest_x, nest_y), blocked=None if obstacles is None
+            else obstacles.cells(FIELD_CELL_SIZE, 0.5))
+        self.sprites = None
+
+    def _noise(self, count: int, scale: float) -> np.ndarray:
+        """``count`` float32 values uniform in ``[-scale, scale)``."""
+        noise = self.rng.random(count, dtype=np.float32)
+        noise *= 2 * scale
+        noise -= scale
+        return noise
+
+    def remove(self, mask: np.ndarray) -> dict:
+        """
+        Take the selected ants out of the colony.
+
+        Parameters
+        ----------
+        mask : np.ndarray
+            Boolean mask of the ants to remove.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            The removed ants, one array per name in ``ANT_FIELDS``.
+        """
+        keep = ~mask
+        ants = {}
+        for name in ANT_FIELDS:
+            values = getattr(self, name)
+            ants[name] = values[mask]
+            setattr(self, name, values[keep])
+        self.count = len(self.x)
+        return ants
+
+    def add(self, ants: dict):
+        """
+        Append ants taken from another colony with ``remove``.
+
+        Parameters
+        ----------
+        ants : dict[str, np.ndarray]
+            One array per name in ``ANT_FIELDS``.
+        """
+        for name in ANT_FIELDS:
+            values = getattr(self, name)
+            setattr(self, name, np.concatenate((values, ants[name]),
+                                               dtype=values.dtype))
+        self.count = len(self.x)
+
+    def update(self, food_index: FoodRaster | SpatialHash,
+               pheromone_grid: PheromoneGrid):
+        """
+        Advance every ant by one tick.
+
+        Parameters
+        ----------
+        food_index : FoodRaster | SpatialHash
+            Index of the food sources.
+        pheromone_grid : PheromoneGrid
+            The pheromone grid.
+        """
+        self.detect_food(food_index)
+        self.move()
+        self.turn()
+        self.leave_pheromone_trail(pheromone_grid)
+        self.detect_nest()
+        self.set_desired_direction(pheromone_grid)
+
+    def detect_food(self, food_index: FoodRaster | SpatialHash):
+        """
+        Pick up food for every searching ant inside a food source.
+
+        Parameters
+        ----------
+        food_index : FoodRaster | SpatialHash
+            Index of the food sources; a ``FoodRaster`` with quantities is
+            depleted by the ants that pick up.
+        """
+        found = food_index.take(food_index.query(self.x, self.y),
+                                ~self.carrying_food)
+        self.carrying_food |= found
+        self.mode[found] = RETURNING_HOME
+
+    def move(self):
+        """
+        Move all ants along their heading and bounce them off the walls.
+
+        An ant that would leave the world keeps its position on that axis
+        and mirrors its desired angle, exactly like ``PyAnts.Ant.update``.
+        Obstacles are resolved the same way, x first and then y from the
+        new x, so an ant only ever lands on a free pixel.
+        """
+        new_x = self.x + self.speed * np.cos(self.angle)
+        new_y = self.y + self.speed * np.sin(self.angle)
+        self.angle += self._noise(self.count, self.rnd_rate)
+
+        if self.obstacles is None:
+            inside_x = (new_x >= 0) & (new_x < self.size[0])
+            np.copyto(self.x, new_x, where=inside_x)
+            inside_y = (new_y >= 0) & (new_y < self.size[1])
+        else:
+            inside_x = self.obstacles.free(new_x, self.y)
+            np.copyto(self.x, new_x, where=inside_x)
+            inside_y = self.obstacles.free(self.x, new_y)
+        np.copyto(self.y, new_y, where=inside_y)
+        np.subtract(math.pi, self.desired_angle, out=self.desired_angle,
+                    where=~inside_x)
+        np.negative(self.desired_angle, out=self.desired_angle,
+                    where=~inside_y)
+        self.wall = ~(inside_x & inside_y)
+
+    def turn(self):
+        """
+        Turn every ant towards its desired angle by ``turn_rate``.
+
+        The difference is wrapped to ``[-pi, pi)`` so ants take the short way
+        round instead of spinning after repeated wall bounces.
+        """
+        diff = (self.desired_angle - self.angle + math.pi) % (2 * math.pi) \
+            - math.pi
+        self.angle += diff * self.turn_rate
+
+    def leave_pheromone_trail(self, pheromone_grid: PheromoneGrid):
+        """
+        Deposit pheromone under every ant according to its mode.
+
+        Parameters
+        ----------
+        pheromone_grid : PheromoneGrid
+            The pheromone grid.
+        """
+        pheromone_grid.deposit(self.x, self.y, self.mode == RETURNING_HOME)
+
+    def detect_nest(self):
+        """
+        Drop food for every carrying ant inside the nest.
+        """
+        dx = self.x - self.nest_x
+        dy = self.y - self.nest_y
+        home = self.carrying_food & \
+            (dx * dx + dy * dy <= self.nest_radius * self.nest_radius)
+        self.carrying_food &= ~home
+        self.mode[home] = LOOKING_FOR_FOOD
+        self.desired_angle[home] = self.angle[home] + math.pi
+        self.delivered += int(np.count_nonzero(home))
+
+    def set_desired_direction(self, pheromone_grid: PheromoneGrid):
+        """
+        Steer searching ants along food trails and returning ants home.
+
+        Parameters
+        ----------
+        pheromone_grid : PheromoneGrid
+            The pheromone grid.
+        """
+        returning = self.mode == RETURNING_HOME
+        searching = ~returning
+        self.desired_angle[searching] = self.sensors.steer(
+            pheromone_grid, pheromone_grid.grid_food, self.x[searching],
+            self.y[searching], self.angle[searching],
+            self.desired_angle[searching])
+        # one gather for every ant beats arctan2 for the returning ones
+        np.copyto(self.desired_angle, self.homing.heading(self.x, self.y),
+                  where=returning)
+
+    def draw(self, screen: pygame.Surface):
+        """
+        Draw all ants on the given screen in one batch, coloured by mode.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The surface to draw the ants on.
+        """
+        if self.sprites is None:
+            self.sprites = AntSprites(ANT_RADIUS, (ANT_COLOR, ANT_FOOD_COLOR))
+        self.sprites.draw(screen, self.x, self.y, self.mode)
+
+
+def random_food_sources(count: int = FOOD_SOURCE_COUNT,
+                        radius: float = FOOD_SOURCE_RADIUS, size=SCREEN,
+                        rng=None, obstacles: ObstacleMap | None = None):
+    """
+    Place food sources at random inside the world.
+
+    Parameters
+    ----------
+    count : int
+        Number of food sources.
+    radius : float
+        Radius of every food source.
+    size : tuple[int, int]
+        Width and height of the world.
+    rng : np.random.Generator | int | None
+        Generator or seed for the placement.
+    obstacles : ObstacleMap | None
+        Walls; sources centered in a wall are placed again.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        ``(F, 2)`` food centers and ``(F,)`` food radii.
+    """
+    rng = np.random.default_rng(rng)
+    low = int(radius)
+
+    def place(n):
+        return rng.integers(low, (size[0] - low, size[1] - low),
+                            size=(n, 2), endpoint=True).astype(np.float32)
+
+    food_xy = place(count)
+    for _ in range(FOOD_PLACEMENT_TRIES if obstacles is not None else 0):
+        walled = ~obstacles.free(food_xy[:, 0], food_xy[:, 1])
+        if not walled.any():
+            break
+        food_xy[walled] = place(int(np.count_nonzero(walled)))
+    food_radius = np.full(count, radius, dtype=np.float32)
+    return food_xy, food_radius
+
+
+def main(obstacles_path=None):
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN)
+
+    obstacles = ObstacleMap(load_obstacles(obstacles_path, SCREEN)) \
+        if obstacles_path else None
+    colony = Colony(ANTS_COUNT, SCREEN[0] / 2, SCREEN[1] / 2,
+                    obstacles=obstacles)
+    food_xy, food_radius = random_food_sources(obstacles=obstacles)
+    food_index = FoodRaster(SCREEN)
+    food_index.build(food_xy, food_radius, FOOD_SOURCE_QUANTITY)
+    pheromone_grid = PheromoneGrid(SCREEN)
+    if obstacles is not None:
+        pheromone_grid.set_obstacles(obstacles.cells(GRID_SIZE))
+
+    def draw_static(surface: pygame.Surface):
+        if obstacles is not None:
+            obstacles.draw(surface)
+        pygame.draw.circle(surface, (255, 0, 0),
+                           (colony.nest_x, colony.nest_y), colony.nest_radius)
+        for source, ((x, y), radius) in enumerate(
+                zip(food_xy.tolist(), food_radius.tolist())):
+            if food_index.quantity is None or food_index.quantity[source]:
+                pygame.draw.circle(surface, (255, 255, 0), (x, y), radius)
+
+    renderer = Renderer(screen, pheromone_grid, draw_static)
+
+    def step():
+        colony.update(food_index, pheromone_grid)
+        pheromone_grid.update()
+
+    def render():
+        for source in food_index.pop_exhausted():
+            x, y = food_xy[source].tolist()
+            radius = food_radius[source].item()
+            renderer.invalidate(pygame.Rect(x - radius - 1, y - radius - 1,
+                                            2 * radius + 3, 2 * radius + 3))
+        renderer.mark_points(colony.x, colony.y, ANT_RADIUS)
+        renderer.draw(colony.draw)
+
+    SimulationLoop(step, render, fps=FPS).run()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    # `--obstacles PNG` loads walls from the bright pixels of an image
+    main(parse_obstacles_path())
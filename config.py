@@ -0,0 +1,193 @@
+import dataclasses
+import numpy as np
+from colony import (ANT_RND_RATE, ANT_SPEED, ANT_TURN_RATE, ANTS_COUNT,
+                    FOOD_SOURCE_COUNT, FOOD_SOURCE_QUANTITY,
+                    FOOD_SOURCE_RADIUS, NEST_RADIUS, SCREEN, Colony,
+                    random_food_sources)
+from obstacles import ObstacleMap, load_obstacles
+from pheromones import (GRID_DTYPE, GRID_SIZE, PHEROMONE_DECAY_RATE,
+                        PHEROMONE_DIFFUSION, PheromoneGrid)
+from spatial import FoodRaster
+
+
+@dataclasses.dataclass(frozen=True)
+class SimConfig:
+    """
+    Every tuning knob of one simulation run.
+
+    Configs are immutable; derive variants with ``replace``, e.g.
+    ``config.replace(ant_turn_rate=0.2)``.
+
+    Attributes
+    ----------
+    size : tuple[int, int]
+        Width and height of the world.
+    ants_count : int
+        Number of ants.
+    ant_speed : float
+        Distance an ant moves per tick.
+    ant_turn_rate : float
+        Fraction of the way to the desired angle turned per tick.
+    ant_rnd_rate : float
+        Maximum random change of heading per tick.
+    nest_radius : float
+        Radius of the nest, which sits in the middle of the world.
+    food_source_count : int
+        Number of food sources.
+    food_source_radius : float
+        Radius of every food source.
+    food_source_quantity : int | None
+        Units of food per source, None for sources that never run out.
+    pheromone_decay_rate : float
+        Decay in percent per tick of nest pheromone; food pheromone decays
+        2.5 times slower.
+    pheromone_diffusion : float
+        Neighbour weight of the pheromone diffusion kernel, 0 to disable.
+    cell_size : int
+        Edge length of a pheromone cell in pixels.
+    dtype : str
+        Storage type of the pheromone grids.
+    obstacles : str | None
+        Image to load walls from (see ``obstacles.load_obstacles``), None
+        for an open world.
+    seed : int | None
+        Seed of the generator behind all randomness of the run.
+    """
+
+    size: tuple = SCREEN
+    ants_count: int = ANTS_COUNT
+    ant_speed: float = ANT_SPEED
+    ant_turn_rate: float = ANT_TURN_RATE
+    ant_rnd_rate: float = ANT_RND_RATE
+    nest_radius: float = NEST_RADIUS
+    food_source_count: int = FOOD_SOURCE_COUNT
+    food_source_radius: float = FOOD_SOURCE_RADIUS
+    food_source_quantity: int | None = FOOD_SOURCE_QUANTITY
+    pheromone_decay_rate: float = PHEROMONE_DECAY_RATE
+    pheromone_diffusion: float = PHEROMONE_DIFFUSION
+    cell_size: int = GRID_SIZE
+    dtype: str = GRID_DTYPE
+    obstacles: str | None = None
+    seed: int | None = None
+
+    def replace(self, **changes) -> "SimConfig":
+        """
+        Copy of this config with some fields changed.
+        """
+        return dataclasses.replace(self, **changes)
+
+    @property
+    def nest(self) -> tuple:
+        """The nest's x- and y-coordinate."""
+        return self.size[0] / 2, self.size[1] / 2
+
+    def obstacle_map(self) -> ObstacleMap | None:
+        """
+        Load the walls of this config, None for an open world.
+        """
+        if self.obstacles is None:
+            return None
+        return ObstacleMap(load_obstacles(self.obstacles, self.size))
+
+    def pheromone_grid(self, render: bool = False,
+                       obstacles: ObstacleMap | None = None) -> PheromoneGrid:
+        """
+        Create an empty pheromone grid for this config.
+
+        Parameters
+        ----------
+        render : bool
+            Keep the pheromone surfaces for drawing.
+        obstacles : ObstacleMap | None
+            Walls to keep free of pheromone.
+        """
+        pheromone_grid = PheromoneGrid(
+            self.size, nest_decay=self.pheromone_decay_rate / 100,
+            food_decay=self.pheromone_decay_rate / 250, render=render,
+            cell_size=self.cell_size, dtype=self.dtype,
+            diffusion=self.pheromone_diffusion)
+        if obstacles is not None:
+            pheromone_grid.set_obstacles(obstacles.cells(self.cell_size))
+        return pheromone_grid
+
+
+class World:
+    """
+    One ``Colony`` run: the ants, their food and their pheromones.
+
+    Created by ``build_world``; the config is kept for reference only,
+    changing it does not affect the world.
+    """
+
+    def __init__(self, config: SimConfig, colony: Colony,
+                 pheromone_grid: PheromoneGrid, food, food_index: FoodRaster):
+        """
+        Initialize a World object.
+
+        Parameters
+        ----------
+        config : SimConfig
+            The config the world was built from.
+        colony : Colony
+            The ants.
+        pheromone_grid : PheromoneGrid
+            The pheromone grid.
+        food : tuple[np.ndarray, np.ndarray]
+            Food centers and radii as placed; remaining quantities are
+            tracked by ``food_index``.
+        food_index : FoodRaster
+            Label raster of the food sources.
+        """
+        self.config = config
+        self.colony = colony
+        self.pheromone_grid = pheromone_grid
+        self.food = food
+        self.food_index = food_index
+        self.tick = 0
+
+    def step(self):
+        """
+        Advance the world by one tick.
+        """
+        self.colony.update(self.food_index, self.pheromone_grid)
+        self.pheromone_grid.update()
+        self.tick += 1
+
+
+def build_world(config: SimConfig = SimConfig(), render: bool = False,
+                rng=None) -> World:
+    """
+    Build the nest, food sources, ants, pheromone grid and food index of a
+    ``Colony`` run.
+
+    Nothing here touches pygame unless ``render`` is set, so many worlds
+    can be built and run one after another in the same process.
+    A ValueError is raised when ``config.obstacles`` puts a wall on the
+    nest.
+
+    Parameters
+    ----------
+    config : SimConfig
+        The parameters of the run.
+    render : bool
+        Keep the pheromone surfaces for drawing.
+    rng : np.random.Generator | None
+        Generator to draw from instead of one seeded with ``config.seed``.
+
+    Returns
+    -------
+    World
+        The world at tick 0.
+    """
+    rng = np.random.default_rng(config.seed if rng is None else rng)
+    obstacles = config.obstacle_map()
+    food = random_food_sources(config.food_source_count,
+                               config.food_source_radius, config.size,
+                               rng, obstacles)
+    colony = Colony(config.ants_count, *config.nest, config.nest_radius,
+                    config.size, rng, config.ant_speed,
+                    config.ant_turn_rate, config.ant_rnd_rate, obstacles)
+    food_index = FoodRaster(config.size)
+    food_index.build(*food, config.food_source_quantity)
+    return World(config, colony, config.pheromone_grid(render, obstacles),
+                 food, food_index)
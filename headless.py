@@ -0,0 +1,163 @@
+import argparse
+import json
+import time
+import numpy as np
+from checkpoint import load_colony, save_colony
+from config import SimConfig, build_world
+from spatial import FoodRaster
+
+# Globals
+# General
+SCREEN = (2000, 1000)
+TICKS = 1000
+# Ant settings
+ANTS_COUNT = 100_000
+
+
+def parse_headless_ticks(argv=None):
+    """
+    Read ``--headless TICKS`` from the command line.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        Arguments to parse, ``sys.argv[1:]`` when omitted.
+
+    Returns
+    -------
+    int | None
+        The number of ticks to run headless, or None for a windowed run.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--headless", type=int, metavar="TICKS")
+    args, _ = parser.parse_known_args(argv)
+    return args.headless
+
+
+def run_headless(ticks: int = TICKS, ants_count: int = ANTS_COUNT,
+                 size=SCREEN, seed: int | None = None,
+                 workers: int | None = None, resume: str | None = None,
+                 checkpoint: str | None = None,
+                 obstacles: str | None = None) -> dict:
+    """
+    Run the colony engine for a fixed number of ticks without any display.
+
+    Nothing here initialises pygame: there is no window, no frame cap and no
+    drawing, so throughput is bounded by the model alone.
+
+    Parameters
+    ----------
+    ticks : int
+        Number of simulation ticks.
+    ants_count : int
+        Number of ants.
+    size : tuple[int, int]
+        Width and height of the world.
+    seed : int | None
+        Seed for food placement and ant noise.
+    workers : int | None
+        Run a ``parallel.ParallelColony`` over this many processes instead
+        of a single ``Colony``.
+    resume : str | None
+        Continue from this checkpoint directory instead of tick 0; the ant
+        count, ant motion parameters, size and seed come from the
+        checkpoint.
+    checkpoint : str | None
+        Write a checkpoint here after the last tick.
+    obstacles : str | None
+        Image to load walls from; not supported with ``workers``.
+
+    Returns
+    -------
+    dict
+        Metrics of the run plus the final ``colony`` and ``pheromone_grid``.
+    """
+    if workers:
+        if obstacles:
+            raise ValueError("obstacles are not supported with workers")
+        return _run_parallel(ticks, ants_count, size, seed, workers)
+    if resume:
+        colony, pheromone_grid, food, tick = load_colony(resume, render=False)
+        size = colony.size
+        food_index = FoodRaster(size)
+        food_index.build(*food)
+    else:
+        world = build_world(SimConfig(size=size, ants_count=ants_count,
+                                      obstacles=obstacles, seed=seed))
+        colony, pheromone_grid = world.colony, world.pheromone_grid
+        food, food_index, tick = world.food, world.food_index, 0
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        colony.update(food_index, pheromone_grid)
+        pheromone_grid.update()
+    seconds = time.perf_counter() - start
+    if checkpoint:
+        save_colony(checkpoint, colony, pheromone_grid, food_index.food,
+                    tick + ticks)
+
+    return {
+        "ticks": ticks,
+        "ants": colony.count,
+        "size": list(size),
+        "seconds": seconds,
+        "ticks_per_second": ticks / seconds if seconds else float("inf"),
+        "delivered": colony.delivered,
+        "carrying": int(np.count_nonzero(colony.carrying_food)),
+        "colony": colony,
+        "pheromone_grid": pheromone_grid,
+    }
+
+
+def _run_parallel(ticks, ants_count, size, seed, workers) -> dict:
+    from parallel import ParallelColony
+
+    with ParallelColony(ants_count, size[0] / 2, size[1] / 2, size=size,
+                        workers=workers, seed=seed) as colony:
+        start = time.perf_counter()
+        for _ in range(ticks):
+            colony.update()
+        seconds = time.perf_counter() - start
+        carrying = int(np.count_nonzero(colony.gather()["carrying_food"]))
+
+    return {
+        "ticks": ticks,
+        "ants": ants_count,
+        "size": list(size),
+        "workers": len(colony.processes),
+        "seconds": seconds,
+        "ticks_per_second": ticks / seconds if seconds else float("inf"),
+        "delivered": colony.delivered,
+        "carrying": carrying,
+        "colony": colony,
+        "pheromone_grid": colony.pheromone_grid,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the colony engine headless and print metrics.")
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--ants", type=int, default=ANTS_COUNT)
+    parser.add_argument("--width", type=int, default=SCREEN[0])
+    parser.add_argument("--height", type=int, default=SCREEN[1])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="split the world over this many processes")
+    parser.add_argument("--resume", metavar="DIR",
+                        help="continue from this checkpoint")
+    parser.add_argument("--checkpoint", metavar="DIR",
+                        help="write a checkpoint after the last tick")
+    parser.add_argument("--obstacles", metavar="PNG",
+                        help="load walls from the bright pixels of an image")
+    args = parser.parse_args()
+
+    result = run_headless(args.ticks, args.ants, (args.width, args.height),
+                          args.seed, args.workers, args.resume,
+                          args.checkpoint, args.obstacles)
+    del result["colony"], result["pheromone_grid"]
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
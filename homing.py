@@ -0,0 +1,190 @@
+import math
+import numpy as np
+
+# Globals
+# General
+SCREEN = (2000, 1000)
+# Homing field settings
+FIELD_CELL_SIZE = 8
+# Neighbour offsets of the 8-connected distance propagation
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1),
+              (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class NestField:
+    """
+    Precomputed homing field: per-cell heading and path length to the nest.
+
+    Returning ants steer with one lookup instead of computing ``arctan2``
+    towards the nest every tick. The field is built once and rebuilt with
+    ``build`` only when the nest or the blocked cells change.
+
+    Without blocked cells the field is exact, the heading from every cell
+    center straight to the nest. With blocked cells, path lengths are
+    propagated around them over the 8-connected cell grid and every cell
+    heads for its neighbour closest to the nest, so ants follow the
+    shortest path instead of a straight line into a wall.
+    """
+
+    def __init__(self, size=SCREEN, nest=(SCREEN[0] / 2, SCREEN[1] / 2),
+                 cell_size: int = FIELD_CELL_SIZE, blocked=None):
+        """
+        Initialize and build a NestField.
+
+        Parameters
+        ----------
+        size : tuple[int, int]
+            Width and height of the world.
+        nest : tuple[float, float]
+            The nest's x- and y-coordinate.
+        cell_size : int
+            Edge length of a cell in pixels.
+        blocked : np.ndarray | None
+            Boolean ``(cols, rows)`` mask of impassable cells.
+        """
+        self.size = size
+        self.cell_size = cell_size
+        self.shape = (math.ceil(size[0] / cell_size),
+                      math.ceil(size[1] / cell_size))
+        self._buffers = {}
+        self.build(nest, blocked)
+
+    def build(self, nest=None, blocked=None):
+        """
+        (Re)compute the field.
+
+        Parameters
+        ----------
+        nest : tuple[float, float] | None
+            New nest position; keeps the current one when None.
+        blocked : np.ndarray | None
+            Boolean ``(cols, rows)`` mask of impassable cells, None for an
+            open world.
+        """
+        if nest is not None:
+            self.nest = tuple(float(value) for value in nest)
+        self.blocked = None if blocked is None or not np.any(blocked) \
+            else np.asarray(blocked, dtype=bool)
+        cs = self.cell_size
+        cx = ((np.arange(self.shape[0]) + 0.5) * cs)[:, None]
+        cy = ((np.arange(self.shape[1]) + 0.5) * cs)[None, :]
+        dx = self.nest[0] - cx
+        dy = self.nest[1] - cy
+        if self.blocked is None:
+            self.distance = np.hypot(dx, dy).astype(np.float32)
+            self.angle = np.arctan2(dy, dx).astype(np.float32)
+        else:
+            self.distance = self._propagate()
+            self.angle = self._descend(np.arctan2(dy, dx).astype(np.float32))
+        self.direction = np.stack((np.cos(self.angle), np.sin(self.angle)),
+                                  axis=-1)
+        self.direction.flags.writeable = False
+
+    def _descend(self, angle: np.ndarray) -> np.ndarray:
+        """
+        Point every cell at its neighbour with the shortest remaining path.
+
+        Cells whose path does not lead through a neighbour, i.e. the
+        nest's own cell and cells cut off from it, keep the straight
+        heading in ``angle``.
+        """
+        best = np.full(self.shape, np.inf, dtype=np.float32)
+        step_angle = np.empty(self.shape, dtype=np.float32)
+        padded = np.pad(self.distance, 1, constant_values=np.inf)
+        for ox, oy in NEIGHBOURS:
+            neighbour = padded[1 + ox:1 + ox + self.shape[0],
+                               1 + oy:1 + oy + self.shape[1]] + \
+                math.hypot(ox, oy) * self.cell_size
+            closer = neighbour < best
+            best[closer] = neighbour[closer]
+            step_angle[closer] = math.atan2(oy, ox)
+        # a cell's path leads through its best neighbour when that matches
+        # its own distance, up to float32 rounding
+        through = np.isfinite(best) & \
+            (best <= self.distance + 1e-3 * self.cell_size)
+        angle[through] = step_angle[through]
+        return angle
+
+    def _propagate(self) -> np.ndarray:
+        """Path length from every cell to the nest around blocked cells."""
+        cs = self.cell_size
+        distance = np.full(self.shape, np.inf, dtype=np.float32)
+        ix = min(max(int(self.nest[0] // cs), 0), self.shape[0] - 1)
+        iy = min(max(int(self.nest[1] // cs), 0), self.shape[1] - 1)
+        distance[ix, iy] = math.hypot(self.nest[0] - (ix + 0.5) * cs,
+                                      self.nest[1] - (iy + 0.5) * cs)
+        open_cells = ~self.blocked
+        padded = np.full((self.shape[0] + 2, self.shape[1] + 2), np.inf,
+                         dtype=np.float32)
+        candidate = np.empty_like(distance)
+        # relax all cells at once until no path gets shorter; takes as
+        # many rounds as the longest path has cells
+        while True:
+            padded[1:-1, 1:-1] = distance
+            relaxed = distance.copy()
+            for ox, oy in NEIGHBOURS:
+                np.add(padded[1 + ox:1 + ox + self.shape[0],
+                              1 + oy:1 + oy + self.shape[1]],
+                       math.hypot(ox, oy) * cs, out=candidate)
+                np.minimum(relaxed, candidate, out=relaxed)
+            relaxed[~open_cells] = np.inf
+            relaxed[ix, iy] = distance[ix, iy]
+            if np.array_equal(relaxed, distance):
+                return distance
+            distance = relaxed
+
+    def _cells(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        n = len(x)
+        b = self._buffers
+        if b.get("n") != n:
+            b.update(n=n, ix=np.empty(n, dtype=np.intp),
+                     iy=np.empty(n, dtype=np.intp),
+                     out=np.empty(n, dtype=np.float32))
+        ix, iy = b["ix"], b["iy"]
+        np.floor_divide(x, self.cell_size, out=ix, casting="unsafe")
+        np.floor_divide(y, self.cell_size, out=iy, casting="unsafe")
+        np.clip(ix, 0, self.shape[0] - 1, out=ix)
+        np.clip(iy, 0, self.shape[1] - 1, out=iy)
+        ix *= self.shape[1]
+        ix += iy
+        return ix
+
+    def heading(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Heading towards the nest at each point, for all points at once.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The x-coordinates of the points.
+        y : np.ndarray
+            The y-coordinates of the points.
+
+        Returns
+        -------
+        np.ndarray
+            Angle in radians per point. The array is an internal buffer
+            reused by the next call.
+        """
+        return np.take(self.angle.reshape(-1), self._cells(x, y),
+                       out=self._buffers["out"])
+
+    def _cell(self, x: float, y: float):
+        ix = min(max(int(x // self.cell_size), 0), self.shape[0] - 1)
+        iy = min(max(int(y // self.cell_size), 0), self.shape[1] - 1)
+        return ix, iy
+
+    def heading_at(self, x: float, y: float) -> float:
+        """
+        Heading towards the nest at one point.
+        """
+        return float(self.angle[self._cell(x, y)])
+
+    def direction_at(self, x: float, y: float) -> np.ndarray:
+        """
+        Unit vector towards the nest at one point.
+
+        Returns a read-only view into the field, so nothing is allocated
+        per call.
+        """
+        return self.direction[self._cell(x, y)]
@@ -0,0 +1,105 @@
+import time
+import pygame
+
+# Globals
+FPS = 60
+# Simulation ticks per rendered frame
+SUBSTEPS = 1
+# Tick multiplier while fast-forwarding (F key); rendering is not capped
+FAST_FORWARD = 10
+# Frames that may be skipped in a row when the simulation falls behind
+MAX_SKIPPED_FRAMES = 5
+
+
+class SimulationLoop:
+    """
+    Main loop with the simulation decoupled from rendering.
+
+    Every frame runs ``substeps`` simulation ticks and then renders once,
+    paced to ``fps``. When ticking took so long that the frame deadline has
+    already passed, rendering is skipped (at most ``MAX_SKIPPED_FRAMES`` in
+    a row, so the window stays live). Fast-forward multiplies the substeps
+    by ``FAST_FORWARD`` and drops the frame cap.
+
+    Keys: F toggles fast-forward, +/- change the substeps, Esc quits.
+    """
+
+    def __init__(self, step, render, substeps: int = SUBSTEPS,
+                 fps: int = FPS, fast_forward: bool = False):
+        """
+        Initialize a SimulationLoop.
+
+        Parameters
+        ----------
+        step : callable
+            ``step()`` advances the simulation by one tick.
+        render : callable
+            ``render()`` draws and presents one frame.
+        substeps : int
+            Simulation ticks per rendered frame.
+        fps : int
+            Target frames per second.
+        fast_forward : bool
+            Start in fast-forward mode.
+        """
+        self.step = step
+        self.render = render
+        self.substeps = substeps
+        self.fps = fps
+        self.fast_forward = fast_forward
+        self.running = True
+        self.ticks = 0
+        self.frames = 0
+        self.skipped_frames = 0
+
+    def handle_events(self):
+        """
+        Process quit and speed control events.
+        """
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif event.key == pygame.K_f:
+                    self.fast_forward = not self.fast_forward
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS,
+                                   pygame.K_KP_PLUS):
+                    self.substeps += 1
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.substeps = max(1, self.substeps - 1)
+
+    def run(self):
+        """
+        Run until the window is closed.
+        """
+        frame_time = 1 / self.fps
+        next_frame = time.perf_counter()
+        skipped = 0
+        while self.running:
+            self.handle_events()
+            steps = self.substeps * (FAST_FORWARD if self.fast_forward
+                                     else 1)
+            for _ in range(steps):
+                self.step()
+            self.ticks += steps
+
+            now = time.perf_counter()
+            next_frame += frame_time
+            if now > next_frame:
+                if skipped < MAX_SKIPPED_FRAMES:
+                    skipped += 1
+                    self.skipped_frames += 1
+                    continue
+                next_frame = now  # give up catching up
+            skipped = 0
+            self.render()
+            self.frames += 1
+
+            if self.fast_forward:
+                next_frame = time.perf_counter()
+            else:
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
@@ -1,8 +1,12 @@
 
 import numpy as np
 import pygame
-import sys
 import math
+from loop import SimulationLoop
+from pheromones import diffuse
+from homing import NestField
+from render import AntSprites
+from spatial import FoodRaster
 
 WIDTH = 800
 HEIGHT = 600
@@ -17,7 +21,9 @@ FOOD_COLOR = (255, 165, 0)
 BG_COLOR = (0, 0, 0)
 FPS = 60
 DECAY_RATE = 0.95
+DIFFUSION = 0
 FOOD_THRESHOLD = 3
+FOOD_QUANTITY = 1
 HOME_THRESHOLD = 50
 DESIRED_DIR_CHANGE_PROB = 0.05
 FOOD_PHEROMONE_STRENGTH = 1
@@ -25,44 +31,44 @@ HOME_PHEROMONE_STRENGTH = 5
 
 
 class Ant:
-    def __init__(self, x, y, nest):
+    def __init__(self, x, y, nest, direction, speed):
         self.x = x
         self.y = y
-        self.direction = np.random.rand(2) - 0.5
-        self.direction /= np.linalg.norm(self.direction)
-        self.speed = np.random.uniform(0.5, 2)
+        self.direction = direction / np.linalg.norm(direction)
+        self.speed = speed
         self.nest = nest
         self.has_food = False
 
-    def update(self, food, food_pheromone, home_pheromone, looking_for_food_pheromone, got_food_pheromone):
+    def update(self, food, food_raster, food_pheromone, home_pheromone,
+               looking_for_food_pheromone, got_food_pheromone,
+               new_direction=None):
         if self.has_food:
-            self.follow_pheromone(home_pheromone, got_food_pheromone)
+            self.follow_pheromone(home_pheromone, got_food_pheromone,
+                                  new_direction)
             if self.nest.distance(self) < HOME_THRESHOLD:
                 self.has_food = False
         else:
-            self.detect_food(food)
-            self.follow_pheromone(looking_for_food_pheromone, food_pheromone)
+            self.detect_food(food, food_raster)
+            self.follow_pheromone(looking_for_food_pheromone, food_pheromone,
+                                  new_direction)
         self.leave_pheromone_trail(
             got_food_pheromone if self.has_food else looking_for_food_pheromone
         )
 
-    def detect_food(self, food):
-        for f in food:
-            if self.distance(f) < FOOD_THRESHOLD:
-                self.direction = (f.pos() - self.pos()) / \
-                    np.linalg.norm(f.pos() - self.pos())
-                self.has_food = True
-                food.remove(f)
-                break
-
-    def follow_pheromone(self, pheromone1, pheromone2):
-        if np.random.rand() < DESIRED_DIR_CHANGE_PROB:
-            self.direction = np.random.rand(2) - 0.5
-            self.direction /= np.linalg.norm(self.direction)
+    def detect_food(self, food, food_raster):
+        source = food_raster.label(self.x, self.y)
+        if food_raster.take_one(source):
+            f = food[source]
+            self.direction = (f.pos() - self.pos()) / \
+                np.linalg.norm(f.pos() - self.pos())
+            self.has_food = True
+
+    def follow_pheromone(self, pheromone1, pheromone2, new_direction=None):
+        if new_direction is not None:
+            self.direction = new_direction / np.linalg.norm(new_direction)
         pos = self.pos()
         if self.has_food:
-            direction = self.nest.pos() - pos
-            direction /= np.linalg.norm(direction)
+            direction = self.nest.field.direction_at(self.x, self.y)
             desired_dir = direction + pheromone2.value_at(pos) * direction
         else:
             desired_dir = self.direction + \
@@ -89,6 +95,8 @@ class Nest:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        # homing directions, looked up by returning ants
+        self.field = NestField((WIDTH, HEIGHT), (x, y))
 
     def pos(self):
         return np.array([self.x, self.y])
@@ -111,10 +119,10 @@ class Food:
 
 
 class PheromoneGrid:
-    def __init__(self, width, height):
+    def __init__(self, width, height, grid=None):
         self.width = width
         self.height = height
-        self.grid = np.zeros((width, height))
+        self.grid = np.zeros((width, height)) if grid is None else grid
 
     def add_pheromone(self, x, y, strength):
         i = math.floor(x)
@@ -125,62 +133,78 @@ class PheromoneGrid:
     def value_at(self, pos):
         i = math.floor(pos[0])
         j = math.floor(pos[1])
-        return self.grid[i, j]
+        if i >= 0 and i < self.width and j >= 0 and j < self.height:
+            return self.grid[i, j]
+        return 0
 
     def decay(self):
         self.grid *= DECAY_RATE
 
 
 class App:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.clock = pygame.time.Clock()
-        self.nest = Nest(np.random.uniform(0, WIDTH),
-                         np.random.uniform(0, HEIGHT))
-        self.food = [Food(np.random.uniform(0, WIDTH),
-                          np.random.uniform(0, HEIGHT)) for _ in range(N_FOOD)]
-        self.ants = [Ant(self.nest.x, self.nest.y, self.nest)
-                     for _ in range(N_ANT)]
-        self.looking_for_food_pheromone = PheromoneGrid(HEIGHT, WIDTH)
-        self.got_food_pheromone = PheromoneGrid(HEIGHT, WIDTH)
-        self.food_pheromone = PheromoneGrid(HEIGHT, WIDTH)
-        self.home_pheromone = PheromoneGrid(HEIGHT, WIDTH)
-        self.ant_counts = PheromoneGrid(HEIGHT, WIDTH)
+    def __init__(self, headless=False, seed=None):
+        if not headless:
+            pygame.init()
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.rng = np.random.default_rng(seed)
+        self.nest = Nest(*self.rng.uniform((0, 0), (WIDTH, HEIGHT)))
+        self.food = [Food(x, y) for x, y in self.rng.uniform(
+            (0, 0), (WIDTH, HEIGHT), (N_FOOD, 2))]
+        # food is picked up by cell lookup; a source is cleared from the
+        # raster once its quantity runs out
+        self.food_raster = FoodRaster((WIDTH, HEIGHT), cell_size=1)
+        self.food_raster.build([f.pos() for f in self.food],
+                               np.full(N_FOOD, FOOD_THRESHOLD), FOOD_QUANTITY)
+        self.ants = [Ant(self.nest.x, self.nest.y, self.nest, direction,
+                         speed)
+                     for direction, speed in zip(
+                         self.rng.random((N_ANT, 2)) - 0.5,
+                         self.rng.uniform(0.5, 2, N_ANT))]
+        # the decaying grids are channels of one array, evaporated (and
+        # diffused) together
+        self.channels = np.zeros((4, WIDTH, HEIGHT), dtype=np.float32)
+        self.scratch = [np.empty_like(self.channels) for _ in range(3)] \
+            if DIFFUSION else None
+        self.looking_for_food_pheromone = PheromoneGrid(
+            WIDTH, HEIGHT, self.channels[0])
+        self.got_food_pheromone = PheromoneGrid(
+            WIDTH, HEIGHT, self.channels[1])
+        self.food_pheromone = PheromoneGrid(WIDTH, HEIGHT, self.channels[2])
+        self.home_pheromone = PheromoneGrid(WIDTH, HEIGHT, self.channels[3])
+        self.ant_counts = PheromoneGrid(WIDTH, HEIGHT)
+        self.ant_sprites = AntSprites(
+            ANT_SIZE // 2, (LOOKING_FOR_FOOD_COLOR, GOT_FOOD_COLOR))
 
     def run(self):
-        while True:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        SimulationLoop(self.update, self.draw, fps=FPS).run()
+        pygame.quit()
 
     def update(self):
-        for ant in self.ants:
-            ant.update(self.food, self.food_pheromone, self.home_pheromone,
-                       self.looking_for_food_pheromone, self.got_food_pheromone)
+        # all of this tick's direction changes in one draw
+        change = self.rng.random(len(self.ants)) < DESIRED_DIR_CHANGE_PROB
+        directions = self.rng.random((len(self.ants), 2)) - 0.5
+        for ant, changed, direction in zip(self.ants, change, directions):
+            ant.update(self.food, self.food_raster, self.food_pheromone,
+                       self.home_pheromone, self.looking_for_food_pheromone,
+                       self.got_food_pheromone,
+                       direction if changed else None)
             self.ant_counts.add_pheromone(ant.x, ant.y, 1)
-        self.food_pheromone.decay()
-        self.home_pheromone.decay()
-        self.looking_for_food_pheromone.decay()
-        self.got_food_pheromone.decay()
+        if DIFFUSION:
+            diffuse(self.channels, DECAY_RATE, DIFFUSION, self.scratch)
+        else:
+            self.channels *= DECAY_RATE
 
     def draw(self):
         self.screen.fill(BG_COLOR)
-        for f in self.food:
-            f.draw(self.screen)
+        for f, left in zip(self.food, self.food_raster.quantity):
+            if left:
+                f.draw(self.screen)
         pygame.draw.circle(self.screen, NEST_COLOR, (int(
             self.nest.x), int(self.nest.y)), ANT_SIZE // 2)
-        for ant in self.ants:
-            color = GOT_FOOD_COLOR if ant.has_food else LOOKING_FOR_FOOD_COLOR
-            pygame.draw.circle(self.screen, color,
-                               (int(ant.x), int(ant.y)), ANT_SIZE // 2)
+        self.ant_sprites.draw(
+            self.screen, np.array([ant.x for ant in self.ants]),
+            np.array([ant.y for ant in self.ants]),
+            np.array([ant.has_food for ant in self.ants], dtype=np.uint8))
         pygame.display.flip()
 
 
@@ -2,6 +2,11 @@ import itertools
 import pygame
 import random
 import math
+import numpy as np
+import time
+from headless import parse_headless_ticks
+from loop import SimulationLoop
+from render import AntSprites
 
 SCREEN = (2000, 1000)
 FPS = 60
@@ -18,10 +23,6 @@ ANT_RADIUS = 5
 PHEROMONE_DECAY_RATE = 2
 PHEROMONE_SIZE = 1
 
-pygame.init()
-screen = pygame.display.set_mode(SCREEN)
-clock = pygame.time.Clock()
-
 
 class Ant:
     def __init__(self, x: int, y: int):
@@ -190,7 +191,11 @@ class PheromoneGrid:
         return grid_x, grid_y
 
 
-def main():
+def main(headless_ticks=None):
+    pygame.init()
+    if headless_ticks is None:
+        screen = pygame.display.set_mode(SCREEN)
+
     nest_coords = (SCREEN[0] // 2, SCREEN[1] // 2)
     global nest
     nest = Nest(*nest_coords)
@@ -205,31 +210,40 @@ def main():
     quadtree.insert(food, food_rect)
     ants = [Ant(*nest_coords) for _ in range(ANTS_COUNT)]
     pheromone_grid = PheromoneGrid(SCREEN[0], SCREEN[1], PHEROMONE_SIZE)
+    ant_sprites = AntSprites(ANT_RADIUS, (ANT_COLOR,))
 
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+    def step():
+        for ant in ants:
+            ant.update(food_sources, pheromone_grid, quadtree)
+        pheromone_grid.evaporate(PHEROMONE_DECAY_RATE)
+        pheromone_grid.update()
 
+    if headless_ticks is not None:
+        start = time.perf_counter()
+        for _ in range(headless_ticks):
+            step()
+        seconds = time.perf_counter() - start
+        print(f"{headless_ticks} ticks in {seconds:.2f}s "
+              f"({headless_ticks / seconds:.1f} ticks/s)")
+        pygame.quit()
+        return
+
+    def render():
         screen.fill((0, 0, 0))
 
         nest.draw(screen)
         for food in food_sources:
             food.draw(screen)
 
-        for ant in ants:
-            ant.update(food_sources, pheromone_grid, quadtree)
-            ant.draw(screen)
-        pheromone_grid.evaporate(PHEROMONE_DECAY_RATE)
-        pheromone_grid.update()
+        ant_sprites.draw(screen, np.array([ant.x for ant in ants]),
+                         np.array([ant.y for ant in ants]))
         pheromone_grid.draw(screen)
 
         pygame.display.flip()
-        clock.tick(FPS)
 
+    SimulationLoop(step, render, fps=FPS).run()
     pygame.quit()
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_headless_ticks())
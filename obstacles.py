@@ -0,0 +1,155 @@
+import argparse
+import numpy as np
+import pygame
+
+# Globals
+# Mask pixels at least this bright (0-255) are walls
+OBSTACLE_THRESHOLD = 128
+OBSTACLE_COLOR = (90, 90, 90)
+
+
+def parse_obstacles_path(argv=None):
+    """
+    Read ``--obstacles PNG`` from the command line.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        Arguments to parse, ``sys.argv[1:]`` when omitted.
+
+    Returns
+    -------
+    str | None
+        Image to load walls from, or None for an open world.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--obstacles", metavar="PNG")
+    args, _ = parser.parse_known_args(argv)
+    return args.obstacles
+
+
+def load_obstacles(path: str, size=None,
+                   threshold: int = OBSTACLE_THRESHOLD) -> np.ndarray:
+    """
+    Read a wall mask from an image.
+
+    Walls are the bright pixels, so a maze is drawn white on black. The
+    image is stretched to ``size`` without smoothing if it differs.
+
+    Parameters
+    ----------
+    path : str
+        PNG (or any format pygame loads) of the world.
+    size : tuple[int, int] | None
+        Width and height of the world; the image's size when None.
+    threshold : int
+        Mean channel value from which a pixel is a wall.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean ``(W, H)`` mask indexed ``[x, y]``, True for walls.
+    """
+    image = pygame.image.load(path)
+    if size is not None and image.get_size() != tuple(size):
+        image = pygame.transform.scale(image, size)
+    rgb = pygame.surfarray.array3d(image)
+    return rgb.sum(axis=2, dtype=np.uint16) >= 3 * threshold
+
+
+class ObstacleMap:
+    """
+    Pixel-exact walls of a world.
+
+    ``free`` tests any number of points against the mask and the world
+    bounds with one gather, so collisions of a whole colony are resolved
+    without per-ant branching. ``cells`` coarsens the mask for the
+    pheromone grid and the homing field.
+    """
+
+    def __init__(self, blocked: np.ndarray):
+        """
+        Initialize an ObstacleMap.
+
+        Parameters
+        ----------
+        blocked : np.ndarray
+            Boolean ``(W, H)`` mask indexed ``[x, y]``, True for walls,
+            e.g. from ``load_obstacles``.
+        """
+        self.blocked = np.ascontiguousarray(blocked, dtype=bool)
+        self.size = self.blocked.shape
+        self._flat = self.blocked.reshape(-1)
+
+    def free(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Whether each point lies inside the world and outside every wall.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The x-coordinates of the points.
+        y : np.ndarray
+            The y-coordinates of the points.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask, True for free points.
+        """
+        inside = (x >= 0) & (x < self.size[0]) & (y >= 0) & (y < self.size[1])
+        xi = np.clip(x, 0, self.size[0] - 1).astype(np.intp)
+        yi = np.clip(y, 0, self.size[1] - 1).astype(np.intp)
+        xi *= self.size[1]
+        xi += yi
+        inside &= ~self._flat.take(xi)
+        return inside
+
+    def free_at(self, x: float, y: float) -> bool:
+        """
+        Whether one point lies inside the world and outside every wall, for
+        per-ant callers.
+        """
+        return 0 <= x < self.size[0] and 0 <= y < self.size[1] and \
+            not self.blocked[int(x), int(y)]
+
+    def cells(self, cell_size: int, fraction: float = 1.0) -> np.ndarray:
+        """
+        Coarsen the mask to a grid of square cells.
+
+        Parameters
+        ----------
+        cell_size : int
+            Edge length of a cell in pixels.
+        fraction : float
+            Share of a cell's pixels that must be walls for the cell to
+            count as blocked; 1 for fully covered cells only.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean ``(cols, rows)`` mask, cells past the world's edge
+            padded as free.
+        """
+        cols = -(-self.size[0] // cell_size)
+        rows = -(-self.size[1] // cell_size)
+        padded = np.zeros((cols * cell_size, rows * cell_size), dtype=bool)
+        padded[:self.size[0], :self.size[1]] = self.blocked
+        covered = padded.reshape(cols, cell_size, rows, cell_size).sum(
+            axis=(1, 3), dtype=np.int32)
+        return covered >= fraction * cell_size * cell_size
+
+    def draw(self, surface: pygame.Surface, color=OBSTACLE_COLOR):
+        """
+        Paint the walls onto a surface of the world's size.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw on, e.g. a renderer's background.
+        color : tuple[int, int, int]
+            Wall color.
+        """
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[self.blocked] = color
+        del pixels  # unlock the surface
@@ -0,0 +1,221 @@
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+import numpy as np
+from colony import ANT_FIELDS, Colony, random_food_sources
+from pheromones import GRID_DTYPE, GRID_SIZE, TILE_SIZE, PheromoneGrid
+from spatial import FoodRaster
+
+# Globals
+# General
+SCREEN = (2000, 1000)
+WORKERS = os.cpu_count() or 1
+# PheromoneGrid arrays placed in shared memory
+SHARED_ARRAYS = ("grid_nest", "grid_food", "active_nest", "active_food")
+
+
+def _share(pheromone_grid: PheromoneGrid, blocks) -> None:
+    """Rebind the grid's arrays to the given shared memory blocks."""
+    for name, block in zip(SHARED_ARRAYS, blocks):
+        array = getattr(pheromone_grid, name)
+        setattr(pheromone_grid, name, np.ndarray(
+            array.shape, dtype=array.dtype, buffer=block.buf))
+
+
+def _worker(conn, barrier, blocks, size, cell_size, dtype, columns, food,
+            nest, seed):
+    """
+    Simulate the ants of one strip.
+
+    Each ``step`` message adds the ants handed over by the controller, runs
+    one ``Colony.update``, waits until every strip has deposited, decays the
+    tile columns this strip owns, and replies with the ants that left the
+    strip plus the running delivery count.
+    """
+    pheromone_grid = PheromoneGrid(size, render=False, cell_size=cell_size,
+                                   dtype=dtype)
+    _share(pheromone_grid, blocks)
+    # sources never run out here: quantities would have to be shared
+    food_index = FoodRaster(size)
+    food_index.build(*food[:2])
+    colony = Colony(0, *nest, size=size, rng=np.random.default_rng(seed))
+    pixels = TILE_SIZE * cell_size
+    x0 = columns.start * pixels if columns.start else -np.inf
+    x1 = columns.stop * pixels if columns.stop < pheromone_grid.tiles[0] \
+        else np.inf
+
+    while True:
+        command, ants = conn.recv()
+        if command == "step":
+            if ants is not None:
+                colony.add(ants)
+            colony.update(food_index, pheromone_grid)
+            # decay must not race with deposits from neighbouring strips
+            barrier.wait()
+            pheromone_grid.update(columns)
+            leaving = (colony.x < x0) | (colony.x >= x1)
+            conn.send((colony.remove(leaving) if leaving.any() else None,
+                       colony.delivered))
+        elif command == "gather":
+            conn.send({name: getattr(colony, name) for name in ANT_FIELDS})
+        else:
+            break
+    for block in blocks:
+        block.close()
+
+
+class ParallelColony:
+    """
+    Colony engine split over worker processes by vertical strips.
+
+    The world is cut into strips of whole pheromone tile columns, one per
+    worker process. Both pheromone channels and their active tile masks live
+    in ``multiprocessing.shared_memory``: every worker deposits and senses
+    anywhere in the shared grid but only decays the tiles of its own strip,
+    after a barrier so no deposit is lost to a concurrent decay. Ants that
+    cross a strip boundary are returned to the controller and handed to the
+    strip they entered at the start of the next tick, so every ant runs
+    exactly one ``Colony.update`` per tick.
+
+    Strips are persistent processes rather than a task pool, because each
+    one owns its ants across ticks. Work is split by area, so the speedup
+    depends on the ants being spread over the world; at the start of a run
+    all ants sit in the nest's strip.
+    """
+
+    def __init__(self, count: int, nest_x: float, nest_y: float,
+                 size=SCREEN, workers: int = WORKERS, food=None,
+                 seed: int | None = None, cell_size: int = GRID_SIZE,
+                 dtype: str = GRID_DTYPE):
+        """
+        Initialize a ParallelColony and start its workers.
+
+        Parameters
+        ----------
+        count : int
+            Number of ants.
+        nest_x : float
+            The x-coordinate of the nest.
+        nest_y : float
+            The y-coordinate of the nest.
+        size : tuple[int, int]
+            Width and height of the world.
+        workers : int
+            Number of strips and worker processes, at most one per tile
+            column.
+        food : tuple[np.ndarray, np.ndarray] | None
+            Food centers and radii; random sources when None.
+        seed : int | None
+            Seed for food placement and ant noise; each worker draws from
+            its own stream spawned from it.
+        cell_size : int
+            Edge length of a pheromone cell in pixels.
+        dtype : str
+            Storage type of the pheromone grids.
+        """
+        self.size = size
+        self.pheromone_grid = PheromoneGrid(size, render=False,
+                                            cell_size=cell_size, dtype=dtype)
+        self.blocks = [shared_memory.SharedMemory(
+            create=True, size=getattr(self.pheromone_grid, name).nbytes)
+            for name in SHARED_ARRAYS]
+        _share(self.pheromone_grid, self.blocks)
+        for name in SHARED_ARRAYS:
+            getattr(self.pheromone_grid, name)[...] = 0
+
+        tiles = self.pheromone_grid.tiles[0]
+        workers = max(1, min(workers, tiles))
+        stops = np.linspace(0, tiles, workers + 1).round().astype(int)
+        # first pixel column of every strip but the first, for routing
+        self.bounds = stops[1:-1] * TILE_SIZE * cell_size
+        seeds = np.random.SeedSequence(seed).spawn(workers + 1)
+        rng = np.random.default_rng(seeds[-1])
+        if food is None:
+            food = random_food_sources(size=size, rng=rng)
+        barrier = mp.Barrier(workers)
+        self.conns = []
+        self.processes = []
+        for index in range(workers):
+            conn, child = mp.Pipe()
+            process = mp.Process(
+                target=_worker, daemon=True,
+                args=(child, barrier, self.blocks, size, cell_size, dtype,
+                      slice(stops[index], stops[index + 1]), food,
+                      (nest_x, nest_y), seeds[index]))
+            process.start()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+        colony = Colony(count, nest_x, nest_y, size=size, rng=rng)
+        self.count = count
+        self.delivered = 0
+        self._arrivals = self._route(
+            [colony.remove(np.ones(count, dtype=bool))])
+
+    def _route(self, ants: list) -> list:
+        """Split handed-over ants by the strip they are in now."""
+        ants = [part for part in ants if part is not None]
+        arrivals = [None] * len(self.conns)
+        if not ants:
+            return arrivals
+        merged = {name: np.concatenate([part[name] for part in ants])
+                  for name in ants[0]}
+        strip = np.searchsorted(self.bounds, merged["x"], side="right")
+        for index in np.unique(strip).tolist():
+            mask = strip == index
+            arrivals[index] = {name: values[mask]
+                               for name, values in merged.items()}
+        return arrivals
+
+    def update(self):
+        """
+        Advance every ant by one tick and decay the pheromones.
+        """
+        for conn, ants in zip(self.conns, self._arrivals):
+            conn.send(("step", ants))
+        replies = [conn.recv() for conn in self.conns]
+        self.delivered = sum(delivered for _, delivered in replies)
+        self._arrivals = self._route([ants for ants, _ in replies])
+
+    def gather(self) -> dict:
+        """
+        Snapshot of all ants, e.g. for drawing or statistics.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            One array per name in ``ANT_FIELDS``; ants still being
+            handed over are included.
+        """
+        for conn in self.conns:
+            conn.send(("gather", None))
+        parts = [conn.recv() for conn in self.conns]
+        parts += [ants for ants in self._arrivals if ants is not None]
+        return {name: np.concatenate([part[name] for part in parts])
+                for name in parts[0]}
+
+    def close(self):
+        """
+        Stop the workers and release the shared memory.
+
+        The grids are copied out first, so ``pheromone_grid`` stays usable.
+        """
+        if not self.blocks:
+            return
+        for conn in self.conns:
+            conn.send(("stop", None))
+        for process in self.processes:
+            process.join()
+        for name in SHARED_ARRAYS:
+            setattr(self.pheromone_grid, name,
+                    getattr(self.pheromone_grid, name).copy())
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,465 @@
+import math
+import numpy as np
+import pygame
+
+# Globals
+# General
+SCREEN = (2000, 1000)
+# Pheromone grid settings
+GRID_SIZE = 1
+GRID_DTYPE = "float32"
+GRID_DTYPES = ("uint8", "float16", "float32")
+# Active tiles: edge length in cells, and the level below which a tile is
+# cleared and retired
+TILE_SIZE = 32
+PHEROMONE_EPSILON = 1
+# Pheromone settings
+PHEROMONE_DECAY_RATE = 2
+# Weight of each axis neighbour in the diffusion kernel, 0 (off) to 0.5
+PHEROMONE_DIFFUSION = 0
+PHEROMONE_STRENGTH = 255
+NEST_PHEROMONE_COLOR = (0, 0, 255)
+FOOD_PHEROMONE_COLOR = (0, 255, 0)
+
+
+def diffuse(grid: np.ndarray, keep: float, diffusion: float, scratch):
+    """
+    Evaporate and diffuse ``grid`` in place in one separable stage.
+
+    Every cell becomes ``keep`` times the ``[d, 1 - 2d, d]`` kernel along x
+    followed by the same kernel along y (a 3x3 blur with total weight
+    ``keep``); the evaporation is folded into the first pass instead of
+    being a separate sweep. Borders are zero-flux, so apart from the
+    evaporation no pheromone is lost. Leading axes are extra channels
+    diffused together.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        ``(..., W, H)`` grid indexed ``[x, y]``.
+    keep : float
+        Fraction of pheromone kept per tick.
+    diffusion : float
+        Neighbour weight ``d`` of the kernel, between 0 and 0.5.
+    scratch : sequence of np.ndarray
+        Three float32 arrays of ``grid``'s shape, reused between calls.
+    """
+    passed, result, shifted = scratch
+    side = np.float32(diffusion * keep)
+    np.multiply(grid, np.float32((1 - 2 * diffusion) * keep), out=passed,
+                casting="same_kind")
+    for source, target in ((np.s_[..., :-1, :], np.s_[..., 1:, :]),
+                           (np.s_[..., 1:, :], np.s_[..., :-1, :])):
+        np.multiply(grid[source], side, out=shifted[target],
+                    casting="same_kind")
+        passed[target] += shifted[target]
+    # zero-flux border: what would flow out reflects back
+    passed[..., 0, :] += side * grid[..., 0, :]
+    passed[..., -1, :] += side * grid[..., -1, :]
+
+    side = np.float32(diffusion)
+    np.multiply(passed, np.float32(1 - 2 * diffusion), out=result)
+    for source, target in ((np.s_[..., :-1], np.s_[..., 1:]),
+                           (np.s_[..., 1:], np.s_[..., :-1])):
+        np.multiply(passed[source], side, out=shifted[target])
+        result[target] += shifted[target]
+    result[..., 0] += side * passed[..., 0]
+    result[..., -1] += side * passed[..., -1]
+    np.copyto(grid, result, casting="unsafe")
+
+
+class PheromoneGrid:
+    """
+    Tiled pheromone engine.
+
+    Both channels are arrays of cells indexed ``[x, y]``, split into
+    ``TILE_SIZE`` square tiles. Deposits mark their tile active; each tick
+    only active tiles are decayed and redrawn, and a tile whose maximum has
+    fallen below ``PHEROMONE_EPSILON`` is cleared and retired. Once most
+    tiles are active the whole channel is decayed with one in-place
+    multiply instead. A cell covers ``cell_size`` x ``cell_size``
+    pixels and is stored as uint8, float16 or float32, trading resolution
+    and precision for memory bandwidth. Rendering writes the grids straight
+    into the alpha planes of two pre-coloured, cell-sized SRCALPHA surfaces
+    that are scaled up to the world when drawn, so the cost of a frame does
+    not depend on how long the simulation has been running.
+
+    With uint8 storage the decay multiply truncates, so every non-zero cell
+    loses at least one unit per tick and faint trails fade linearly.
+
+    With ``diffusion`` the decay becomes ``diffuse``: active tiles and their
+    neighbours (the furthest pheromone can spread in a tick) are diffused
+    and evaporated together, over their bounding box.
+    """
+
+    def __init__(self, size=SCREEN,
+                 nest_decay: float = PHEROMONE_DECAY_RATE / 100,
+                 food_decay: float = PHEROMONE_DECAY_RATE / 250,
+                 render: bool = True, cell_size: int = GRID_SIZE,
+                 dtype: str = GRID_DTYPE,
+                 diffusion: float = PHEROMONE_DIFFUSION):
+        """
+        Initialize a PheromoneGrid object.
+
+        Parameters
+        ----------
+        size : tuple[int, int]
+            Width and height of the world in pixels.
+        nest_decay : float
+            Fraction of nest pheromone lost per tick.
+        food_decay : float
+            Fraction of food pheromone lost per tick.
+        render : bool
+            Keep the alpha surfaces in sync with the grids. Headless runs
+            pass ``False`` and never touch pygame surfaces.
+        cell_size : int
+            Edge length of a grid cell in pixels.
+        dtype : str
+            Storage type of the grids, one of ``GRID_DTYPES``.
+        diffusion : float
+            Neighbour weight of the diffusion kernel, 0 to disable.
+        """
+        if dtype not in GRID_DTYPES:
+            raise ValueError(f"dtype must be one of {GRID_DTYPES}, "
+                             f"not {dtype!r}")
+        if not 0 <= diffusion <= 0.5:
+            raise ValueError(f"diffusion must be between 0 and 0.5, "
+                             f"not {diffusion!r}")
+        self.size = size
+        self.cell_size = cell_size
+        self.inv_cell_size = np.float32(1 / cell_size)
+        self.shape = (math.ceil(size[0] / cell_size),
+                      math.ceil(size[1] / cell_size))
+        # storage is padded to whole tiles so tiles are plain reshape views
+        self.tiles = (math.ceil(self.shape[0] / TILE_SIZE),
+                      math.ceil(self.shape[1] / TILE_SIZE))
+        grid_shape = (self.tiles[0] * TILE_SIZE, self.tiles[1] * TILE_SIZE)
+        self.dtype = np.dtype(dtype)
+        self.grid_nest = np.zeros(grid_shape, dtype=self.dtype)
+        self.grid_food = np.zeros(grid_shape, dtype=self.dtype)
+        self.active_nest = np.zeros(self.tiles, dtype=bool)
+        self.active_food = np.zeros(self.tiles, dtype=bool)
+        self._alpha = np.empty(grid_shape, dtype=np.uint8) if render else None
+        # tiles whose pixels changed since the last take_dirty()
+        self.dirty = np.zeros(self.tiles, dtype=bool)
+        self.nest_keep = np.float32(1 - nest_decay)
+        self.food_keep = np.float32(1 - food_decay)
+        self.diffusion = diffusion
+        # float32 buffers of diffuse(), and tile masks for the spread region
+        self._scratch = None
+        self._grown = np.zeros(self.tiles, dtype=bool)
+        self._grown_x = np.zeros(self.tiles, dtype=bool)
+        # cells inside walls, kept empty; None for an open world
+        self.blocked = None
+        self.render = render
+        self.surface_nest = self.surface_food = None
+        self.scaled_nest = self.scaled_food = None
+        if render:
+            self.surface_nest = self._make_surface(
+                grid_shape, NEST_PHEROMONE_COLOR)
+            self.surface_food = self._make_surface(
+                grid_shape, FOOD_PHEROMONE_COLOR)
+            if cell_size > 1:
+                scaled_size = (grid_shape[0] * cell_size,
+                               grid_shape[1] * cell_size)
+                self.scaled_nest = self._make_surface(
+                    scaled_size, NEST_PHEROMONE_COLOR)
+                self.scaled_food = self._make_surface(
+                    scaled_size, FOOD_PHEROMONE_COLOR)
+
+    def set_obstacles(self, blocked: np.ndarray | None):
+        """
+        Mark the cells that lie inside walls.
+
+        Ants never stand in a fully walled cell, so nothing is deposited
+        there; diffusion is absorbed by the walls instead of spreading
+        through them, so walled cells stay empty and sensors read nothing
+        inside walls at no extra cost per sample.
+
+        Parameters
+        ----------
+        blocked : np.ndarray | None
+            Boolean ``(cols, rows)`` mask of fully walled cells, e.g. from
+            ``ObstacleMap.cells``, or None to remove all walls.
+        """
+        if blocked is None:
+            self.blocked = None
+            return
+        self.blocked = np.zeros(self.grid_nest.shape, dtype=bool)
+        self.blocked[:self.shape[0], :self.shape[1]] = \
+            blocked[:self.shape[0], :self.shape[1]]
+        for grid in (self.grid_nest, self.grid_food):
+            grid[self.blocked] = 0
+
+    @staticmethod
+    def _make_surface(size, color) -> pygame.Surface:
+        surface = pygame.Surface(size, flags=pygame.SRCALPHA)
+        surface.fill((*color, 0))
+        return surface
+
+    def cell(self, x: float, y: float):
+        """
+        Grid index of the cell containing the pixel ``(x, y)``.
+
+        Returns
+        -------
+        tuple[int, int]
+            Index usable as ``grid_nest[cell]``.
+        """
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def deposit(self, x: np.ndarray, y: np.ndarray, returning: np.ndarray):
+        """
+        Deposit pheromone at many positions at once.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The x-coordinates of the deposits.
+        y : np.ndarray
+            The y-coordinates of the deposits.
+        returning : np.ndarray
+            Boolean mask; ``True`` deposits food pheromone, ``False`` nest
+            pheromone.
+        """
+        xi = (x * self.inv_cell_size).astype(np.intp)
+        yi = (y * self.inv_cell_size).astype(np.intp)
+        for grid, active, mask in ((self.grid_nest, self.active_nest,
+                                    ~returning),
+                                   (self.grid_food, self.active_food,
+                                    returning)):
+            gx, gy = xi[mask], yi[mask]
+            grid[gx, gy] = PHEROMONE_STRENGTH
+            active[gx // TILE_SIZE, gy // TILE_SIZE] = True
+
+    def deposit_at(self, grid: np.ndarray, x: float, y: float):
+        """
+        Deposit pheromone at a single position, for per-ant callers.
+
+        Parameters
+        ----------
+        grid : np.ndarray
+            ``grid_nest`` or ``grid_food``.
+        x : float
+            The x-coordinate of the deposit.
+        y : float
+            The y-coordinate of the deposit.
+        """
+        i, j = self.cell(x, y)
+        grid[i, j] = PHEROMONE_STRENGTH
+        active = self.active_nest if grid is self.grid_nest \
+            else self.active_food
+        active[i // TILE_SIZE, j // TILE_SIZE] = True
+
+    def sample(self, grid: np.ndarray, x: np.ndarray,
+               y: np.ndarray) -> np.ndarray:
+        """
+        Read one channel at many positions at once.
+
+        Positions outside the grid are clamped to the border.
+
+        Parameters
+        ----------
+        grid : np.ndarray
+            ``grid_nest`` or ``grid_food``.
+        x : np.ndarray
+            The x-coordinates to sample.
+        y : np.ndarray
+            The y-coordinates to sample.
+
+        Returns
+        -------
+        np.ndarray
+            The pheromone values, same shape as ``x``.
+        """
+        xi = np.clip(x * self.inv_cell_size, 0,
+                     self.shape[0] - 1).astype(np.intp)
+        yi = np.clip(y * self.inv_cell_size, 0,
+                     self.shape[1] - 1).astype(np.intp)
+        # one flat take is much cheaper than 2-D fancy indexing
+        xi *= grid.shape[1]
+        xi += yi
+        return grid.ravel().take(xi)
+
+    def update(self, columns: slice = slice(None)):
+        """
+        Decay the active tiles of both channels and refresh the surfaces.
+
+        Parameters
+        ----------
+        columns : slice
+            Range of tile columns (along x) to update. Parallel workers
+            sharing one grid each pass the strip they own.
+        """
+        start, stop, _ = columns.indices(self.tiles[0])
+        if self.diffusion:
+            if (start, stop) != (0, self.tiles[0]):
+                raise ValueError("diffusion crosses strips; update the "
+                                 "whole grid")
+            for grid, active, keep, surface in (
+                    (self.grid_nest, self.active_nest, self.nest_keep,
+                     self.surface_nest),
+                    (self.grid_food, self.active_food, self.food_keep,
+                     self.surface_food)):
+                if active.any():
+                    self._update_diffuse(grid, active, keep, surface)
+            return
+        cells = slice(start * TILE_SIZE, stop * TILE_SIZE)
+        for grid, active, keep, surface in (
+                (self.grid_nest, self.active_nest, self.nest_keep,
+                 self.surface_nest),
+                (self.grid_food, self.active_food, self.food_keep,
+                 self.surface_food)):
+            grid, active = grid[cells], active[start:stop]
+            ti, tj = np.nonzero(active)
+            if len(ti) == 0:
+                continue
+            if 2 * len(ti) > active.size:
+                self._update_dense(grid, active, keep, surface, start)
+            else:
+                self._update_tiles(grid, active, keep, surface, ti, tj,
+                                   start)
+
+    def _tile_view(self, grid: np.ndarray) -> np.ndarray:
+        return grid.reshape(-1, TILE_SIZE, self.tiles[1], TILE_SIZE)
+
+    def _update_dense(self, grid, active, keep, surface, start):
+        np.multiply(grid, keep, out=grid, casting="unsafe")
+        view = self._tile_view(grid)
+        dead = active & (view.max(axis=(1, 3)) < PHEROMONE_EPSILON)
+        di, dj = np.nonzero(dead)
+        view[di, :, dj, :] = 0
+        stop = start + len(active)
+        if self.render:
+            self.dirty[start:stop] |= active
+        active &= ~dead
+        if self.render:
+            # casting into a contiguous buffer first keeps the strided
+            # write into the surface a plain byte copy
+            cells = slice(start * TILE_SIZE, stop * TILE_SIZE)
+            np.copyto(self._alpha[cells], grid, casting="unsafe")
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[cells] = self._alpha[cells]
+            del alpha  # unlock the surface before it is blitted
+
+    def _update_diffuse(self, grid, active, keep, surface):
+        # pheromone spreads at most one cell per tick: grow the active tiles
+        # by their 8 neighbours and work on the bounding box
+        grown, grown_x = self._grown, self._grown_x
+        np.copyto(grown_x, active)
+        grown_x[1:] |= active[:-1]
+        grown_x[:-1] |= active[1:]
+        np.copyto(grown, grown_x)
+        grown[:, 1:] |= grown_x[:, :-1]
+        grown[:, :-1] |= grown_x[:, 1:]
+        rows = np.flatnonzero(grown.any(axis=1))
+        columns = np.flatnonzero(grown.any(axis=0))
+        tiles = np.s_[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+        cells = np.s_[rows[0] * TILE_SIZE:(rows[-1] + 1) * TILE_SIZE,
+                      columns[0] * TILE_SIZE:(columns[-1] + 1) * TILE_SIZE]
+        # diffuse the world's cells only, so the zero-flux border is the
+        # world's edge and nothing spreads into the tile padding
+        world = np.s_[rows[0] * TILE_SIZE:
+                      min((rows[-1] + 1) * TILE_SIZE, self.shape[0]),
+                      columns[0] * TILE_SIZE:
+                      min((columns[-1] + 1) * TILE_SIZE, self.shape[1])]
+        region = grid[cells]
+        if self._scratch is None:
+            self._scratch = [np.empty(grid.shape, dtype=np.float32)
+                             for _ in range(3)]
+        diffuse(grid[world], keep, self.diffusion,
+                [scratch[world] for scratch in self._scratch])
+        if self.blocked is not None:
+            region[self.blocked[cells]] = 0
+
+        view = region.reshape(region.shape[0] // TILE_SIZE, TILE_SIZE,
+                              region.shape[1] // TILE_SIZE, TILE_SIZE)
+        alive = view.max(axis=(1, 3)) >= PHEROMONE_EPSILON
+        di, dj = np.nonzero(~alive)
+        view[di, :, dj, :] = 0
+        active[tiles] = alive
+        if self.render:
+            self.dirty[tiles] |= grown[tiles]
+            np.copyto(self._alpha[cells], region, casting="unsafe")
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[cells] = self._alpha[cells]
+            del alpha  # unlock the surface before it is blitted
+
+    def _update_tiles(self, grid, active, keep, surface, ti, tj, start):
+        view = self._tile_view(grid)
+        tiles = view[ti, :, tj, :]  # (K, TILE_SIZE, TILE_SIZE) copy
+        np.multiply(tiles, keep, out=tiles, casting="unsafe")
+        dead = tiles.max(axis=(1, 2)) < PHEROMONE_EPSILON
+        tiles[dead] = 0
+        view[ti, :, tj, :] = tiles
+        active[ti[dead], tj[dead]] = False
+        if self.render:
+            ti = ti + start
+            self.dirty[ti, tj] = True
+            offsets = np.arange(TILE_SIZE)
+            xs = ti[:, None, None] * TILE_SIZE + offsets[None, :, None]
+            ys = tj[:, None, None] * TILE_SIZE + offsets[None, None, :]
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[xs, ys] = tiles
+            del alpha  # unlock the surface before it is blitted
+
+    def take_dirty(self) -> np.ndarray:
+        """
+        Tiles redrawn since the previous call, for dirty-rect rendering.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean ``tiles`` mask; the internal mask is cleared.
+        """
+        dirty = self.dirty.copy()
+        self.dirty[:] = False
+        return dirty
+
+    def draw(self, screen: pygame.Surface, rects=None):
+        """
+        Draw the pheromone surfaces on the given screen.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The surface to draw the pheromones on.
+        rects : list[pygame.Rect] | None
+            Only draw these screen areas; everything when None.
+        """
+        nest, food = self.surface_nest, self.surface_food
+        if self.cell_size > 1:
+            if rects is None:
+                for surface, scaled in (
+                        (self.surface_nest, self.scaled_nest),
+                        (self.surface_food, self.scaled_food)):
+                    pygame.transform.scale(surface, scaled.get_size(),
+                                           scaled)
+            else:
+                # upscale only the cells under the areas being drawn
+                for rect in rects:
+                    self._scale_area(rect)
+            nest, food = self.scaled_nest, self.scaled_food
+        if rects is None:
+            screen.blit(nest, (0, 0))
+            screen.blit(food, (0, 0))
+            return
+        for rect in rects:
+            screen.blit(nest, rect, rect)
+            screen.blit(food, rect, rect)
+
+    def _scale_area(self, rect: pygame.Rect):
+        """Refresh the scaled surfaces under one screen area."""
+        cs = self.cell_size
+        cells = pygame.Rect(rect.left // cs, rect.top // cs,
+                            -(-rect.right // cs) - rect.left // cs,
+                            -(-rect.bottom // cs) - rect.top // cs)
+        cells = cells.clip(self.surface_nest.get_rect())
+        if not cells.w or not cells.h:
+            return
+        area = pygame.Rect(cells.x * cs, cells.y * cs, cells.w * cs,
+                           cells.h * cs)
+        for surface, scaled in ((self.surface_nest, self.scaled_nest),
+                                (self.surface_food, self.scaled_food)):
+            pygame.transform.scale(surface.subsurface(cells), area.size,
+                                   scaled.subsurface(area))
@@ -0,0 +1,256 @@
+import argparse
+import collections
+import csv
+import json
+import time
+import numpy as np
+import pygame
+
+# Globals
+# Ticks averaged by the overlay, and frames between overlay text refreshes
+ROLLING_TICKS = 60
+OVERLAY_REFRESH = 15
+OVERLAY_FONT_SIZE = 18
+OVERLAY_COLOR = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 160)
+# Records kept for export, a bit over an hour of frames at 60 FPS, and the
+# number of records the per-phase history arrays grow by
+MAX_HISTORY = 1 << 18
+HISTORY_CHUNK = 4096
+
+
+def parse_profile_path(argv=None):
+    """
+    Read ``--profile FILE`` from the command line.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        Arguments to parse, ``sys.argv[1:]`` when omitted.
+
+    Returns
+    -------
+    str | None
+        ``.csv`` or ``.json`` file to export phase timings to, or None to
+        not profile.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", metavar="FILE")
+    args, _ = parser.parse_known_args(argv)
+    return args.profile
+
+
+class _Phase:
+    """Reusable context manager adding its elapsed time to one phase."""
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info):
+        current = self.timer.current
+        current[self.name] = current.get(self.name, 0) + \
+            time.perf_counter_ns() - self.start
+
+
+class _NoPhase:
+    """Context manager that does nothing, for disabled timers."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class PhaseTimer:
+    """
+    Per-phase timing of the simulation and rendering hot path.
+
+    Code wraps each phase in ``with timer.phase(name):`` and calls
+    ``end_tick`` once per record: after every tick when nothing is drawn,
+    or after every rendered frame, so that a frame's render phases share a
+    record with the ticks simulated for it. Phases are timed with
+    ``perf_counter_ns`` through one cached context manager per name, so the
+    overhead is a couple of microseconds per phase. Phases that ran several
+    times in a record are summed, e.g. the ticks of a frame that caught up
+    on skipped frames; phases that did not run count as zero.
+
+    The history for ``export`` is one preallocated nanosecond array per
+    phase, grown ``HISTORY_CHUNK`` records at a time up to ``max_history``
+    records; past that it is a ring that keeps the latest records, so a
+    long profiled run takes bounded memory.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = ROLLING_TICKS,
+                 history: bool = True, unit: str = "tick",
+                 max_history: int = MAX_HISTORY):
+        """
+        Initialize a PhaseTimer.
+
+        Parameters
+        ----------
+        enabled : bool
+            Time phases; a disabled timer hands out no-op phases.
+        window : int
+            Number of ticks averaged for ``means`` and the overlay.
+        history : bool
+            Keep records for ``export``.
+        unit : str
+            What one record covers, ``"tick"`` or ``"frame"``; names the
+            index column of ``export``.
+        max_history : int
+            Number of latest records kept for ``export``.
+        """
+        self.enabled = enabled
+        self.unit = unit
+        self.names = []
+        self.current = {}
+        self.recent = collections.deque(maxlen=window)
+        # phase name -> record timings in ns; slot ``record % max_history``
+        self.history = {} if history else None
+        self.max_history = max_history
+        self._allocated = 0
+        self.ticks = 0
+        self._phases = {}
+        self._no_phase = _NoPhase()
+        self._font = None
+        self._overlay = None
+        self._frames = 0
+
+    def phase(self, name: str):
+        """
+        Context manager timing one phase.
+
+        Parameters
+        ----------
+        name : str
+            Phase name, e.g. ``"ants"`` or ``"flip"``.
+        """
+        if not self.enabled:
+            return self._no_phase
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+            self.names.append(name)
+        return phase
+
+    def end_tick(self):
+        """
+        Close the current record, one tick or one frame; see ``unit``.
+        """
+        if not self.enabled:
+            return
+        self.recent.append(self.current)
+        if self.history is not None:
+            self._record(self.current)
+        self.current = {}
+        self.ticks += 1
+
+    def _record(self, record: dict):
+        slot = self.ticks % self.max_history
+        if slot >= self._allocated:
+            # only while the ring is not full yet
+            self._allocated = min(self._allocated + HISTORY_CHUNK,
+                                  self.max_history)
+            for name, times in self.history.items():
+                grown = np.zeros(self._allocated, dtype=np.int64)
+                grown[:times.size] = times
+                self.history[name] = grown
+        for name in self.names:
+            times = self.history.get(name)
+            if times is None:
+                times = self.history[name] = np.zeros(self._allocated,
+                                                      dtype=np.int64)
+            times[slot] = record.get(name, 0)
+
+    def means(self) -> dict:
+        """
+        Rolling mean per phase in milliseconds.
+
+        Returns
+        -------
+        dict[str, float]
+            Mean over the last ``window`` ticks, in first-seen phase order.
+        """
+        count = len(self.recent) or 1
+        return {name: sum(tick.get(name, 0) for tick in self.recent)
+                / count / 1e6 for name in self.names}
+
+    def draw(self, surface: pygame.Surface, position=(10, 10)) -> pygame.Rect:
+        """
+        Draw the rolling ms/phase overlay.
+
+        The text is re-rendered every ``OVERLAY_REFRESH`` calls with one
+        cached font; in between the cached overlay surface is blitted.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw on.
+        position : tuple[int, int]
+            Top-left corner of the overlay.
+
+        Returns
+        -------
+        pygame.Rect
+            The area drawn.
+        """
+        if self._overlay is None or self._frames % OVERLAY_REFRESH == 0:
+            self._overlay = self._render_overlay()
+        self._frames += 1
+        return surface.blit(self._overlay, position)
+
+    def _render_overlay(self) -> pygame.Surface:
+        if self._font is None:
+            self._font = pygame.font.Font(None, OVERLAY_FONT_SIZE)
+        means = self.means()
+        lines = [f"{name:<12}{ms:7.2f} ms" for name, ms in means.items()]
+        lines.append(f"{'total':<12}{sum(means.values()):7.2f} ms")
+        rendered = [self._font.render(line, True, OVERLAY_COLOR)
+                    for line in lines]
+        height = self._font.get_linesize()
+        overlay = pygame.Surface(
+            (max(text.get_width() for text in rendered) + 8,
+             height * len(rendered) + 8), flags=pygame.SRCALPHA)
+        overlay.fill(OVERLAY_BACKGROUND)
+        for row, text in enumerate(rendered):
+            overlay.blit(text, (4, 4 + row * height))
+        return overlay
+
+    def export(self, path: str):
+        """
+        Write the timings of the kept records in milliseconds.
+
+        Those are every record of the run, or only the latest
+        ``max_history`` ones (``MAX_HISTORY`` by default) for longer runs;
+        the index column still counts from the first record of the run.
+
+        Parameters
+        ----------
+        path : str
+            Output file; JSON if it ends in ``.json``, CSV otherwise.
+        """
+        first = max(self.ticks - self.max_history, 0) \
+            if self.history is not None else self.ticks
+        slots = np.arange(first, self.ticks) % self.max_history
+        columns = {name: (self.history[name][slots] / 1e6).tolist()
+                   for name in self.names}
+        rows = [{self.unit: index,
+                 **{name: times[row] for name, times in columns.items()}}
+                for row, index in enumerate(range(first, self.ticks))]
+        with open(path, "w", newline="") as f:
+            if path.endswith(".json"):
+                json.dump(rows, f)
+                return
+            writer = csv.DictWriter(f, fieldnames=[self.unit, *self.names])
+            writer.writeheader()
+            writer.writerows(rows)
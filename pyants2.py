@@ -1,8 +1,9 @@
 import pygame as pg
 import numpy as np
 import random
-
-pg.init()
+import time
+from headless import parse_headless_ticks
+from loop import SimulationLoop
 
 # Set up constants
 SCREEN_WIDTH = 800
@@ -12,10 +13,6 @@ PHEROMONE_SIZE = 10
 PHEROMONE_DECAY_RATE = 0.05
 ANT_SPEED = 2
 
-# Set up Pygame window
-screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pg.display.set_caption("Ant Colony Optimization Visualization")
-
 # Set up pheromone grid
 pheromone_grid = np.zeros(
     (SCREEN_WIDTH // PHEROMONE_SIZE, SCREEN_HEIGHT // PHEROMONE_SIZE))
@@ -49,8 +46,8 @@ class Ant(pg.sprite.Sprite):
         i, j = int(x // PHEROMONE_SIZE), int(y // PHEROMONE_SIZE)
         neighbors = [(i+di, j+dj) for di in range(-1, 2) for dj in range(-1, 2)
                      if i+di >= 0 and i+di < SCREEN_WIDTH // PHEROMONE_SIZE and j+dj >= 0 and j+dj < SCREEN_HEIGHT // PHEROMONE_SIZE]
-        neighbor_strengths = [pheromone_grid[i+di, j+dj]
-                              for di, dj in neighbors]
+        neighbor_strengths = [pheromone_grid[ni, nj]
+                              for ni, nj in neighbors]
         if neighbor_strengths:
             max_strength = max(neighbor_strengths)
             max_indices = [k for k, v in enumerate(
@@ -65,59 +62,51 @@ class Ant(pg.sprite.Sprite):
         self.pheromone_strength = max(self.pheromone_strength, 0)
 
 
-# Create group of ants
-all_ants = pg.sprite.Group()
-for i in range(NUM_ANTS):
-    ant = Ant((random.randint(0, SCREEN_WIDTH),
-              random.randint(0, SCREEN_HEIGHT)))
-    all_ants.add(ant)
-
-# Main game loop
-running = True
-clock = pg.time.Clock()
-while running:
-    # Handle events
-    for event in pg.event.get():
-        if event.type == pg.QUIT:
-            running = False
-        if event.type == pg.KEYDOWN:
-            if event.key == pg.K_ESCAPE:
-                running = False
-
-    # spawn food
-    if not food and randint(0, 200) == 5:
-        x = randint(10, WIDTH-10)
-        y = randint(10, HEIGHT-10)
-        food = Food((x, y))
-        allsprites.add(food)
-        foods.add(food)
-
-    # update all entities
-    for ant in ants:
-        ant.update(dt)
-        # check if ant collides with food
-        if food and pg.sprite.collide_circle(ant, food):
-            food.pickup()
-            food = None
-
-    # draw background and pheromone grid
-    screen.fill((10, 10, 10))
-    pheroSurface = pherogrid.update(dt)
-    screen.blit(pg.transform.scale(pheroSurface, (WIDTH, HEIGHT)), (0, 0))
-
-    # draw all entities
-    allsprites.draw(screen)
-
-    # update display
-    if SHOWFPS:
-        fps = font.render(str(int(clock.get_fps())), True, pg.Color('white'))
-        screen.blit(fps, (50, 50))
-    pg.display.update()
-    # wait for next tick
-    clock.tick(FPS)
-
-# clean up
-pg.quit()
-
-if name == 'main':
-    main()
+def main(headless_ticks=None):
+    pg.init()
+    if headless_ticks is None:
+        # Set up Pygame window
+        screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pg.display.set_caption("Ant Colony Optimization Visualization")
+
+    # Create group of ants
+    all_ants = pg.sprite.Group()
+    for i in range(NUM_ANTS):
+        ant = Ant((random.randint(0, SCREEN_WIDTH),
+                  random.randint(0, SCREEN_HEIGHT)))
+        all_ants.add(ant)
+
+    if headless_ticks is not None:
+        start = time.perf_counter()
+        for _ in range(headless_ticks):
+            all_ants.update()
+        seconds = time.perf_counter() - start
+        print(f"{headless_ticks} ticks in {seconds:.2f}s "
+              f"({headless_ticks / seconds:.1f} ticks/s)")
+        pg.quit()
+        return
+
+    def render():
+        # draw background and pheromone grid
+        screen.fill((10, 10, 10))
+        pheromone_alpha = np.minimum(pheromone_grid * 25, 255)
+        pheroSurface = pg.surfarray.make_surface(
+            np.dstack([np.zeros_like(pheromone_alpha)] * 2 +
+                      [pheromone_alpha]).astype(np.uint8))
+        screen.blit(pg.transform.scale(
+            pheroSurface, (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
+
+        # draw all entities
+        all_ants.draw(screen)
+
+        # update display
+        pg.display.update()
+
+    # Main game loop
+    SimulationLoop(all_ants.update, render).run()
+    # clean up
+    pg.quit()
+
+
+if __name__ == '__main__':
+    main(parse_headless_ticks())
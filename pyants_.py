@@ -5,6 +5,7 @@ from math import radians, cos, sin, degrees
 from random import randint
 import random
 from pygame.font import Font
+from loop import SimulationLoop
 
 WIDTH = 1200
 HEIGHT = 800
@@ -14,12 +15,6 @@ ANTS = 1
 PHEROMONE_SIZE = 10
 FOOD_COUNT = 10
 FOOD_QUANT = 33
-pygame.init()
-clock = pygame.time.Clock()
-# Set up Pygame window
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Ant Colony Optimization Visualization")
-
 # Set up pheromone grid
 pheromone_grid = np.zeros(
     (WIDTH // PHEROMONE_SIZE, HEIGHT // PHEROMONE_SIZE))
@@ -154,6 +149,11 @@ def update_ants(ants, pheromone_trails, food_sources, nest):
 
 
 def main():
+    pygame.init()
+    # Set up Pygame window
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Ant Colony Optimization Visualization")
+
     # Draw Enviroment
     environment = create_environment()
 
@@ -172,21 +172,21 @@ def main():
         "found": {},
     }
 
-    # Draw FPS COunter
-    font = Font(None, 24)  # Create the font object here
+    # Food quantity labels; fonts are expensive to create, so only once
+    font = Font(None, 20)
 
-    running = True
-    while running:
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+    def step():
+        for key in pheromone_map:
+            for (x, y), value in pheromone_map[key].items():
+                pheromone_map[key][(x, y)] = max(0, value - 0.7)
+        update_ants(ants, pheromone_map, environment, nest)
+        ants.update()
 
+    def render():
         screen.fill((0, 0, 0))
-        # Update and draw pheromone map
+        # Draw pheromone map
         for key in pheromone_map:
             for (x, y), value in pheromone_map[key].items():
-                pheromone_map[key][(x, y)] = max(0, value - 0.7)
                 if value > 0:
                     if key == "looking":
                         pygame.draw.circle(screen, (0, 0, value), (x, y), 1)
@@ -194,7 +194,6 @@ def main():
                         pygame.draw.circle(screen, (0, value, 0), (x, y), 1)
 
         # Draw food
-        font = pygame.font.Font(None, 20)
         for food in environment:
             radius = food.quantity
             pygame.draw.circle(screen, (0, 255, 0),
@@ -205,14 +204,12 @@ def main():
         # Draw Nest
         pygame.draw.circle(screen, (255, 0, 0), (WIDTH // 2, HEIGHT // 2), 20)
 
-        # Call update_ants function
-        update_ants(ants, pheromone_map, environment, nest)
-        # Update and draw ants
-        ants.update()
+        # Draw ants
         ants.draw(screen)
 
         pygame.display.flip()
 
+    SimulationLoop(step, render, fps=FPS).run()
     pygame.quit()
 
 
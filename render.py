@@ -0,0 +1,342 @@
+import functools
+import itertools
+import numpy as np
+import pygame
+from pheromones import TILE_SIZE, PheromoneGrid
+from profiling import PhaseTimer
+
+# Globals
+BACKGROUND_COLOR = (0, 0, 0)
+# Above this fraction of dirty tiles a full frame is cheaper than rects
+FULL_FRAME_FRACTION = 0.5
+# Distinct gradients/stamps kept by radial_alpha and radial_gradient
+GRADIENT_CACHE_SIZE = 64
+
+
+class Renderer:
+    """
+    Dirty-rectangle renderer for the pygame front-end.
+
+    The screen is split into the pheromone grid's tiles. A frame only
+    recomposes (background, pheromones, sprites) and pushes to the display
+    the tiles that changed: pheromone tiles redrawn by ``PheromoneGrid``,
+    tiles holding ants now or in the previous frame, and areas invalidated
+    because nest or food changed. Static objects live on a cached background
+    surface. When most of the screen is dirty the renderer composes and
+    flips a full frame instead.
+    """
+
+    def __init__(self, screen: pygame.Surface, pheromone_grid: PheromoneGrid,
+                 draw_static, timer: PhaseTimer | None = None):
+        """
+        Initialize a Renderer.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The display surface.
+        pheromone_grid : PheromoneGrid
+            The pheromone grid, created with ``render=True``.
+        draw_static : callable
+            ``draw_static(surface)`` draws nest, food and other objects that
+            rarely change onto the background.
+        timer : PhaseTimer | None
+            Times the background, pheromone, sprite and display phases of
+            every frame.
+        """
+        self.screen = screen
+        self.pheromone_grid = pheromone_grid
+        self.draw_static = draw_static
+        self.tile_px = TILE_SIZE * pheromone_grid.cell_size
+        self.tiles = pheromone_grid.tiles
+        self.background = pygame.Surface(screen.get_size())
+        self._ants = np.zeros(self.tiles, dtype=bool)
+        self._prev_ants = np.zeros(self.tiles, dtype=bool)
+        self._dirty = np.zeros(self.tiles, dtype=bool)
+        self._full = True
+        self.timer = timer or PhaseTimer(enabled=False)
+        self.invalidate()
+
+    def invalidate(self, rect: pygame.Rect | None = None):
+        """
+        Redraw the static background and mark it for the next frame.
+
+        Parameters
+        ----------
+        rect : pygame.Rect | None
+            Area that changed; the whole screen when None.
+        """
+        self.background.fill(BACKGROUND_COLOR)
+        self.draw_static(self.background)
+        if rect is None:
+            self._full = True
+            return
+        x0, y0 = rect.left // self.tile_px, rect.top // self.tile_px
+        x1 = (rect.right - 1) // self.tile_px + 1
+        y1 = (rect.bottom - 1) // self.tile_px + 1
+        self._dirty[max(x0, 0):x1, max(y0, 0):y1] = True
+
+    def mark_points(self, x: np.ndarray, y: np.ndarray, radius: float = 0):
+        """
+        Mark the tiles under moving sprites (ants) for this frame.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The x-coordinates of the sprites.
+        y : np.ndarray
+            The y-coordinates of the sprites.
+        radius : float
+            Sprite radius; the tiles under all four corners of each
+            sprite's bounding box are marked.
+        """
+        for dx, dy in ((-radius, -radius), (radius, -radius),
+                       (-radius, radius), (radius, radius)):
+            tx = np.clip((x + dx) // self.tile_px, 0,
+                         self.tiles[0] - 1).astype(np.intp)
+            ty = np.clip((y + dy) // self.tile_px, 0,
+                         self.tiles[1] - 1).astype(np.intp)
+            self._ants[tx, ty] = True
+            if not radius:
+                break
+
+    def mark_rect(self, rect: pygame.Rect):
+        """
+        Mark the tiles under a moving overlay (e.g. timings) for this frame.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            Area drawn by ``draw_sprites``.
+        """
+        x0 = max(rect.left, 0) // self.tile_px
+        y0 = max(rect.top, 0) // self.tile_px
+        x1 = (rect.right - 1) // self.tile_px + 1
+        y1 = (rect.bottom - 1) // self.tile_px + 1
+        self._ants[x0:x1, y0:y1] = True
+
+    def _rects(self, dirty: np.ndarray) -> list:
+        """Merge dirty tiles into one rect per vertical run per column."""
+        rects = []
+        width, height = self.screen.get_size()
+        padded = np.zeros((self.tiles[0], self.tiles[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = dirty
+        edges = np.diff(padded, axis=1)
+        for column in np.flatnonzero(dirty.any(axis=1)):
+            starts = np.flatnonzero(edges[column] == 1)
+            stops = np.flatnonzero(edges[column] == -1)
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                rect = pygame.Rect(column * self.tile_px,
+                                   start * self.tile_px, self.tile_px,
+                                   (stop - start) * self.tile_px)
+                rects.append(rect.clip(0, 0, width, height))
+        return rects
+
+    def draw(self, draw_sprites) -> list:
+        """
+        Compose and present one frame.
+
+        Parameters
+        ----------
+        draw_sprites : callable
+            ``draw_sprites(screen)`` draws everything marked with
+            ``mark_points`` on top of background and pheromones.
+
+        Returns
+        -------
+        list[pygame.Rect]
+            The screen areas that were updated.
+        """
+        dirty = self.pheromone_grid.take_dirty()
+        dirty |= self._dirty
+        dirty |= self._ants
+        dirty |= self._prev_ants
+        self._prev_ants, self._ants = self._ants, self._prev_ants
+        self._ants[:] = False
+        self._dirty[:] = False
+
+        timer = self.timer
+        if self._full or dirty.mean() > FULL_FRAME_FRACTION:
+            self._full = False
+            with timer.phase("background"):
+                self.screen.blit(self.background, (0, 0))
+            with timer.phase("pheromone draw"):
+                self.pheromone_grid.draw(self.screen)
+            with timer.phase("sprites"):
+                draw_sprites(self.screen)
+            with timer.phase("flip"):
+                pygame.display.flip()
+            return [self.screen.get_rect()]
+
+        with timer.phase("background"):
+            rects = self._rects(dirty)
+            for rect in rects:
+                self.screen.blit(self.background, rect, rect)
+        with timer.phase("pheromone draw"):
+            self.pheromone_grid.draw(self.screen, rects)
+        with timer.phase("sprites"):
+            draw_sprites(self.screen)
+        with timer.phase("flip"):
+            pygame.display.update(rects)
+        return rects
+
+
+class AntSprites:
+    """
+    Batched ant renderer.
+
+    A circular ant stamp is rendered once and reduced to its pixel offsets;
+    drawing scatters every offset for all ants at once through a surfarray
+    view, with one colour per ant mode mapped once per target format.
+    Surfaces without a 2-D pixel view (24 bit) fall back to one
+    ``fblits``/``blits`` call per mode using cached coloured stamps.
+    """
+
+    def __init__(self, radius: int, colors):
+        """
+        Initialize the stamp and colour table.
+
+        Parameters
+        ----------
+        radius : int
+            Ant radius in pixels; 0 draws single pixels.
+        colors : sequence of tuple[int, int, int]
+            Colour per ant mode, indexed by the mode codes.
+        """
+        self.radius = radius
+        self.colors = [tuple(color[:3]) for color in colors]
+        stamp = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+        if radius:
+            pygame.draw.circle(stamp, (255, 255, 255), (radius, radius),
+                               radius)
+        else:
+            stamp.set_at((0, 0), (255, 255, 255))
+        dx, dy = np.nonzero(pygame.surfarray.array2d(stamp))
+        self.offsets = list(zip((dx - radius).tolist(),
+                                (dy - radius).tolist()))
+        self._mapped = {}
+        self._stamps = None
+
+    def _map(self, surface: pygame.Surface) -> np.ndarray:
+        key = (surface.get_bitsize(), surface.get_masks())
+        if key not in self._mapped:
+            self._mapped[key] = np.array(
+                [surface.map_rgb(color) for color in self.colors],
+                dtype=np.uint32)
+        return self._mapped[key]
+
+    def draw(self, surface: pygame.Surface, x: np.ndarray, y: np.ndarray,
+             mode: np.ndarray | None = None):
+        """
+        Draw all ants in one batch.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw the ants on.
+        x : np.ndarray
+            The x-coordinates of the ants.
+        y : np.ndarray
+            The y-coordinates of the ants.
+        mode : np.ndarray | None
+            Mode code per ant selecting its colour; mode 0 for all if None.
+        """
+        if surface.get_bytesize() == 3:
+            self._blit(surface, x, y, mode)
+            return
+        mapped = self._map(surface)
+        color = mapped[0] if mode is None else mapped.take(mode)
+        width, height = surface.get_size()
+        xi = x.astype(np.intp)
+        yi = y.astype(np.intp)
+        pixels = pygame.surfarray.pixels2d(surface)
+        for dx, dy in self.offsets:
+            px = xi + dx
+            py = yi + dy
+            inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            pixels[px[inside], py[inside]] = \
+                color if mode is None else color[inside]
+        del pixels  # unlock the surface before it is blitted
+
+    def _blit(self, surface, x, y, mode):
+        if self._stamps is None:
+            self._stamps = []
+            for color in self.colors:
+                stamp = pygame.Surface((2 * self.radius + 1,) * 2)
+                stamp.set_colorkey((0, 0, 0))
+                for dx, dy in self.offsets:
+                    stamp.set_at((dx + self.radius, dy + self.radius), color)
+                self._stamps.append(stamp)
+        blit = getattr(surface, "fblits", None) or \
+            (lambda seq: surface.blits(seq, doreturn=False))
+        corners = np.stack((x - self.radius, y - self.radius), axis=1)
+        for index, stamp in enumerate(self._stamps):
+            selected = corners if mode is None else corners[mode == index]
+            if len(selected):
+                blit(zip(itertools.repeat(stamp),
+                         selected.astype(np.int32).tolist()))
+            if mode is None:
+                break
+
+
+@functools.lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def radial_alpha(width: int, height: int, radius: float) -> np.ndarray:
+    """
+    Alpha field of a radial gradient, fading linearly from 255 at the center
+    to 0 at ``radius``.
+
+    Also usable as a soft deposit stamp. Results are cached and shared, so
+    the array is read-only.
+
+    Returns
+    -------
+    np.ndarray
+        ``(width, height)`` uint8 array indexed ``[x, y]``.
+    """
+    dx = np.arange(width) - width / 2
+    dy = np.arange(height) - height / 2
+    distance = np.hypot(dx[:, None], dy[None, :])
+    alpha = np.clip((radius - distance) / radius, 0, 1)
+    alpha *= 255
+    alpha = alpha.astype(np.uint8)
+    alpha.flags.writeable = False
+    return alpha
+
+
+def radial_gradient(width: int, height: int, color,
+                    radius: float) -> pygame.Surface:
+    """
+    Surface with a radial gradient of ``color``, e.g. a nest or food glow.
+
+    The alpha field comes from ``radial_alpha`` and is written in one go
+    through ``pixels_alpha``. Surfaces are cached by size, colour and
+    radius and shared between callers, so blit them but do not draw on
+    them.
+
+    Parameters
+    ----------
+    width : int
+        Width of the surface.
+    height : int
+        Height of the surface.
+    color : tuple[int, int, int]
+        Colour of the gradient; any alpha component is ignored.
+    radius : float
+        Distance from the center at which the gradient reaches alpha 0.
+
+    Returns
+    -------
+    pygame.Surface
+        A SRCALPHA surface.
+    """
+    return _radial_gradient(width, height, tuple(color[:3]), radius)
+
+
+@functools.lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def _radial_gradient(width, height, color, radius):
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    surface.fill((*color, 0))
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    alpha[...] = radial_alpha(width, height, radius)
+    del alpha  # unlock the surface before it is blitted
+    return surface
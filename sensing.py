@@ -0,0 +1,143 @@
+import math
+import numpy as np
+from obstacles import ObstacleMap
+from pheromones import PheromoneGrid
+
+# Globals
+# Sensor settings (cone_angle and view_distance of PyAnts.Ant)
+SENSOR_ANGLE = math.pi / 8
+SENSOR_DISTANCE = 25
+# Cone kernel: sample distances (fractions of SENSOR_DISTANCE) and angular
+# spread (fractions of SENSOR_ANGLE) around each sensor direction
+KERNEL_DISTANCES = (1.0,)
+KERNEL_SPREAD = (-0.25, 0.0, 0.25)
+# Points tested along each sample's line of sight when there are walls;
+# walls thinner than SENSOR_DISTANCE / SIGHT_STEPS may be seen through
+SIGHT_STEPS = 5
+
+
+class Sensors:
+    """
+    Left/center/right pheromone sensors for a whole colony.
+
+    Each sensor is a small cone kernel of sample points, precomputed once as
+    offsets in the ant's local frame. Sampling rotates the offsets by each
+    ant's heading (one cos/sin per ant, not per point) and reads the grid
+    for all ants and all points in a single gather.
+
+    With walls, a sample only counts if the straight line from the ant to
+    it stays clear of them, so ants do not steer towards trails on the far
+    side of a wall.
+    """
+
+    def __init__(self, angle: float = SENSOR_ANGLE,
+                 distance: float = SENSOR_DISTANCE,
+                 obstacles: ObstacleMap | None = None):
+        """
+        Initialize the sensor kernel.
+
+        Parameters
+        ----------
+        angle : float
+            Angle between the center sensor and the side sensors.
+        distance : float
+            Reach of the sensors in pixels.
+        obstacles : ObstacleMap | None
+            Walls that block the sensors.
+        """
+        self.angle = angle
+        self.distance = distance
+        self.obstacles = obstacles
+        thetas = np.array([[side * angle + spread * angle
+                            for spread in KERNEL_SPREAD
+                            for _ in KERNEL_DISTANCES]
+                           for side in (-1, 0, 1)])
+        radii = np.array([[fraction * distance
+                           for _ in KERNEL_SPREAD
+                           for fraction in KERNEL_DISTANCES]] * 3)
+        # 3 sensors x P points, flattened, as offsets in the ant frame
+        # (heading along +x)
+        self.points = thetas.shape[1]
+        self.forward = (radii * np.cos(thetas)).astype(np.float32).ravel()
+        self.lateral = (radii * np.sin(thetas)).astype(np.float32).ravel()
+        # the line of sight of every sample, ending at the sample itself
+        steps = np.arange(1, SIGHT_STEPS + 1, dtype=np.float32) / SIGHT_STEPS
+        self.sight_forward = self.forward[:, None] * steps
+        self.sight_lateral = self.lateral[:, None] * steps
+
+    def sample(self, pheromone_grid: PheromoneGrid, grid: np.ndarray,
+               x: np.ndarray, y: np.ndarray, angle: np.ndarray) -> np.ndarray:
+        """
+        Sum the pheromone under each sensor of each ant.
+
+        Parameters
+        ----------
+        pheromone_grid : PheromoneGrid
+            The pheromone grid.
+        grid : np.ndarray
+            The channel to sense, ``grid_nest`` or ``grid_food``.
+        x : np.ndarray
+            The x-coordinates of the ants.
+        y : np.ndarray
+            The y-coordinates of the ants.
+        angle : np.ndarray
+            The headings of the ants.
+
+        Returns
+        -------
+        np.ndarray
+            ``(N, 3)`` sums for the left, center and right sensor.
+        """
+        cos = np.cos(angle)[:, None]
+        sin = np.sin(angle)[:, None]
+        px = cos * self.forward
+        px -= sin * self.lateral
+        px += x[:, None]
+        py = sin * self.forward
+        py += cos * self.lateral
+        py += y[:, None]
+        values = pheromone_grid.sample(grid, px, py)
+        if self.obstacles is not None:
+            self._hide_walled(values, x, y, cos, sin)
+        if self.points == 1:
+            return values
+        return values.reshape(len(x), 3, self.points).sum(axis=2)
+
+    def _hide_walled(self, values, x, y, cos, sin):
+        """Zero the samples a wall hides from their ant, in place."""
+        # only samples that sensed something can matter
+        hits = np.flatnonzero(values)
+        if not len(hits):
+            return
+        ant, sample = np.divmod(hits, values.shape[1])
+        cos, sin = cos[ant], sin[ant]
+        sx = cos * self.sight_forward[sample]
+        sx -= sin * self.sight_lateral[sample]
+        sx += x[ant, None]
+        sy = sin * self.sight_forward[sample]
+        sy += cos * self.sight_lateral[sample]
+        sy += y[ant, None]
+        hidden = ~self.obstacles.free(sx, sy).all(axis=1)
+        values.reshape(-1)[hits[hidden]] = 0
+
+    def steer(self, pheromone_grid: PheromoneGrid, grid: np.ndarray,
+              x: np.ndarray, y: np.ndarray, angle: np.ndarray,
+              desired_angle: np.ndarray) -> np.ndarray:
+        """
+        Turn each ant's desired angle towards its strongest sensor.
+
+        Ants that sense nothing keep their current desired angle.
+
+        Returns
+        -------
+        np.ndarray
+            The new desired angles.
+        """
+        samples = self.sample(pheromone_grid, grid, x, y, angle)
+        left, center, right = samples[:, 0], samples[:, 1], samples[:, 2]
+        go_left = (left > center) & (left >= right)
+        go_right = (right > center) & (right > left)
+        sensed = (center > 0) | go_left | go_right
+        steered = angle + self.angle * (go_right.astype(np.float32) -
+                                        go_left.astype(np.float32))
+        return np.where(sensed, steered, desired_angle)
@@ -0,0 +1,404 @@
+import math
+import numpy as np
+
+# Globals
+# General
+SCREEN = (2000, 1000)
+# Spatial hash settings
+CELL_SIZE = 32
+# Food raster settings
+FOOD_CELL_SIZE = 2
+FOOD_LABEL_DTYPE = "int16"
+
+
+class SpatialHash:
+    """
+    Uniform grid index for static, circular world objects (food, ...).
+
+    Every object is registered in each cell its bounding box touches, so the
+    cell an ant stands in already lists every object that can contain it.
+    The cell table is a dense ``(cells, depth)`` index array built once;
+    queries are plain array gathers into buffers that are reused between
+    calls.
+    """
+
+    def __init__(self, size=SCREEN, cell_size: int = CELL_SIZE):
+        """
+        Initialize an empty SpatialHash.
+
+        Parameters
+        ----------
+        size : tuple[int, int]
+            Width and height of the world.
+        cell_size : int
+            Edge length of a cell in pixels.
+        """
+        self.size = size
+        self.cell_size = cell_size
+        self.cols = math.ceil(size[0] / cell_size)
+        self.rows = math.ceil(size[1] / cell_size)
+        self.items = []
+        self.centers = np.empty((0, 2), dtype=np.float32)
+        self.radii = np.empty(0, dtype=np.float32)
+        self._center_x = self._center_y = self._radii_sq = self.radii
+        self.table = np.full((self.cols * self.rows, 0), -1, dtype=np.intp)
+        self.cells = [()] * (self.cols * self.rows)
+        self._buffers = {}
+
+    def build(self, centers: np.ndarray, radii: np.ndarray, items=None):
+        """
+        (Re)build the index from a set of circles.
+
+        Parameters
+        ----------
+        centers : np.ndarray
+            ``(K, 2)`` circle centers.
+        radii : np.ndarray
+            ``(K,)`` circle radii.
+        items : list | None
+            Objects returned by ``candidates``; defaults to the indices.
+        """
+        self.centers = np.asarray(centers, dtype=np.float32).reshape(-1, 2)
+        self.radii = np.asarray(radii, dtype=np.float32)
+        self.items = list(range(len(self.radii))) if items is None \
+            else list(items)
+        # contiguous columns for the gathers of query
+        self._center_x = np.ascontiguousarray(self.centers[:, 0])
+        self._center_y = np.ascontiguousarray(self.centers[:, 1])
+        self._radii_sq = self.radii * self.radii
+
+        cell_lists = [[] for _ in range(self.cols * self.rows)]
+        for index, ((cx, cy), r) in enumerate(zip(self.centers.tolist(),
+                                                  self.radii.tolist())):
+            x0, y0 = self._cell_xy(cx - r, cy - r)
+            x1, y1 = self._cell_xy(cx + r, cy + r)
+            for ix in range(x0, x1 + 1):
+                for iy in range(y0, y1 + 1):
+                    cell_lists[ix * self.rows + iy].append(index)
+
+        depth = max((len(c) for c in cell_lists), default=0)
+        self.table = np.full((len(cell_lists), depth), -1, dtype=np.intp)
+        for cell, indices in enumerate(cell_lists):
+            self.table[cell, :len(indices)] = indices
+        self.cells = [tuple(self.items[i] for i in indices)
+                      for indices in cell_lists]
+
+    def _cell_xy(self, x: float, y: float):
+        ix = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        iy = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return ix, iy
+
+    def candidates(self, x: float, y: float) -> tuple:
+        """
+        Objects registered in the cell containing ``(x, y)``.
+
+        Returns the stored tuple itself, so nothing is allocated per call.
+        """
+        ix, iy = self._cell_xy(x, y)
+        return self.cells[ix * self.rows + iy]
+
+    def _scratch(self, n: int):
+        buffers = self._buffers
+        if buffers.get("n") != n:
+            buffers.update(
+                n=n,
+                ix=np.empty(n, dtype=np.intp),
+                iy=np.empty(n, dtype=np.intp),
+                candidate=np.empty(n, dtype=np.intp),
+                hits=np.empty(n, dtype=np.int32),
+                dx=np.empty(n, dtype=np.float32),
+                dy=np.empty(n, dtype=np.float32),
+                gathered=np.empty(n, dtype=np.float32),
+                valid=np.empty(n, dtype=bool),
+                inside=np.empty(n, dtype=bool),
+            )
+        return buffers
+
+    def take(self, hits: np.ndarray, mask: np.ndarray | None = None):
+        """
+        Points of ``mask`` that are inside an object.
+
+        Objects of a SpatialHash never deplete; see ``FoodRaster.take``.
+        """
+        found = hits >= 0
+        return found if mask is None else found & mask
+
+    def query(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Find the object containing each point, for all points at once.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The x-coordinates of the points.
+        y : np.ndarray
+            The y-coordinates of the points.
+
+        Returns
+        -------
+        np.ndarray
+            Index of the containing object per point, ``-1`` for none. The
+            array is an internal buffer reused by the next call.
+        """
+        b = self._scratch(len(x))
+        hits, ix, iy = b["hits"], b["ix"], b["iy"]
+        hits.fill(-1)
+        if self.table.shape[1] == 0:
+            return hits
+
+        np.floor_divide(x, self.cell_size, out=b["dx"])
+        np.floor_divide(y, self.cell_size, out=b["dy"])
+        np.clip(b["dx"], 0, self.cols - 1, out=b["dx"])
+        np.clip(b["dy"], 0, self.rows - 1, out=b["dy"])
+        ix[:] = b["dx"]
+        iy[:] = b["dy"]
+        ix *= self.rows
+        ix += iy  # ix now holds the flat cell index
+
+        candidate, dx, dy = b["candidate"], b["dx"], b["dy"]
+        gathered, valid, inside = b["gathered"], b["valid"], b["inside"]
+        for k in range(self.table.shape[1]):
+            # in-range modes write straight into ``out``; "raise" would
+            # buffer it
+            np.take(self.table[:, k], ix, out=candidate, mode="clip")
+            np.greater_equal(candidate, 0, out=valid)
+            if not valid.any():
+                break
+            # empty slots (-1) wrap to the last object; ``valid`` masks them
+            np.take(self._center_x, candidate, out=gathered, mode="wrap")
+            np.subtract(x, gathered, out=dx, casting="same_kind")
+            np.take(self._center_y, candidate, out=gathered, mode="wrap")
+            np.subtract(y, gathered, out=dy, casting="same_kind")
+            np.multiply(dx, dx, out=dx)
+            np.multiply(dy, dy, out=dy)
+            dx += dy
+            np.take(self._radii_sq, candidate, out=gathered, mode="wrap")
+            np.less_equal(dx, gathered, out=inside)
+            inside &= valid
+            np.less(hits, 0, out=valid)
+            inside &= valid
+            np.copyto(hits, candidate, where=inside)
+        return hits
+
+
+class FoodRaster:
+    """
+    Label raster of circular food sources with finite quantities.
+
+    Every cell holds the id of the food source covering its center, ``-1``
+    for none, so finding the source under any number of ants is a single
+    gather. ``take`` depletes the sources; one that runs out is cleared
+    from the raster by rewriting only its own bounding box, and reported
+    through ``exhausted`` so callers can redraw it. Where sources overlap,
+    the one built first owns the shared cells.
+
+    Positions are resolved to ``cell_size`` pixels, so points within half a
+    cell of a source's edge may be counted on either side.
+    """
+
+    def __init__(self, size=SCREEN, cell_size: int = FOOD_CELL_SIZE):
+        """
+        Initialize an empty FoodRaster.
+
+        Parameters
+        ----------
+        size : tuple[int, int]
+            Width and height of the world.
+        cell_size : int
+            Edge length of a cell in pixels.
+        """
+        self.size = size
+        self.cell_size = cell_size
+        self.shape = (math.ceil(size[0] / cell_size),
+                      math.ceil(size[1] / cell_size))
+        self.labels = np.full(self.shape, -1, dtype=FOOD_LABEL_DTYPE)
+        self.centers = np.empty((0, 2), dtype=np.float32)
+        self.radii = np.empty(0, dtype=np.float32)
+        self.quantity = None
+        self.boxes = []
+        self.exhausted = []
+        self._buffers = {}
+
+    def build(self, centers: np.ndarray, radii: np.ndarray, quantity=None):
+        """
+        (Re)build the raster from a set of food sources.
+
+        Parameters
+        ----------
+        centers : np.ndarray
+            ``(K, 2)`` source centers.
+        radii : np.ndarray
+            ``(K,)`` source radii.
+        quantity : int | np.ndarray | None
+            Units of food per source, or None for sources that never run
+            out.
+        """
+        self.centers = np.asarray(centers, dtype=np.float32).reshape(-1, 2)
+        self.radii = np.asarray(radii, dtype=np.float32)
+        count = len(self.radii)
+        if count > np.iinfo(self.labels.dtype).max:
+            raise ValueError(f"at most {np.iinfo(self.labels.dtype).max} "
+                             f"food sources, not {count}")
+        self.quantity = None if quantity is None else \
+            np.broadcast_to(quantity, count).astype(np.int64)
+        self.labels.fill(-1)
+        self.boxes = []
+        self.exhausted = []
+        cs = self.cell_size
+        for (cx, cy), r in zip(self.centers.tolist(), self.radii.tolist()):
+            self.boxes.append((
+                slice(max(int((cx - r) // cs), 0),
+                      max(min(int((cx + r) // cs) + 1, self.shape[0]), 0)),
+                slice(max(int((cy - r) // cs), 0),
+                      max(min(int((cy + r) // cs) + 1, self.shape[1]), 0))))
+        for source in range(count):
+            if self.quantity is None or self.quantity[source] > 0:
+                self._paint(source)
+
+    def _paint(self, source: int):
+        """Label the free cells whose centers lie inside a source."""
+        box = self.boxes[source]
+        (cx, cy), r = self.centers[source].tolist(), float(self.radii[source])
+        dx = (np.arange(box[0].start, box[0].stop) + 0.5) * self.cell_size \
+            - cx
+        dy = (np.arange(box[1].start, box[1].stop) + 0.5) * self.cell_size \
+            - cy
+        view = self.labels[box]
+        view[(dx[:, None] ** 2 + dy[None, :] ** 2 <= r * r) & (view < 0)] = \
+            source
+
+    def _clear(self, source: int):
+        """Remove an exhausted source and let overlapped ones take over."""
+        box = self.boxes[source]
+        view = self.labels[box]
+        view[view == source] = -1
+        for other, other_box in enumerate(self.boxes):
+            if other != source and self.quantity[other] > 0 and \
+                    other_box[0].start < box[0].stop and \
+                    box[0].start < other_box[0].stop and \
+                    other_box[1].start < box[1].stop and \
+                    box[1].start < other_box[1].stop:
+                self._paint(other)
+        self.exhausted.append(source)
+
+    @property
+    def food(self) -> tuple:
+        """
+        Centers, radii and, if finite, remaining quantities of the sources,
+        e.g. for ``checkpoint.save``.
+        """
+        if self.quantity is None:
+            return self.centers, self.radii
+        return self.centers, self.radii, self.quantity
+
+    def label(self, x: float, y: float) -> int:
+        """
+        Id of the food source at ``(x, y)``, ``-1`` for none.
+        """
+        ix = int(x // self.cell_size)
+        iy = int(y // self.cell_size)
+        if 0 <= ix < self.shape[0] and 0 <= iy < self.shape[1]:
+            return int(self.labels[ix, iy])
+        return -1
+
+    def query(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Find the food source under each point, for all points at once.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The x-coordinates of the points, inside the world.
+        y : np.ndarray
+            The y-coordinates of the points, inside the world.
+
+        Returns
+        -------
+        np.ndarray
+            Source id per point, ``-1`` for none. The array is an internal
+            buffer reused by the next call.
+        """
+        n = len(x)
+        b = self._buffers
+        if b.get("n") != n:
+            b.update(n=n, ix=np.empty(n, dtype=np.intp),
+                     iy=np.empty(n, dtype=np.intp),
+                     hits=np.empty(n, dtype=self.labels.dtype))
+        ix, iy = b["ix"], b["iy"]
+        np.floor_divide(x, self.cell_size, out=ix, casting="unsafe")
+        np.floor_divide(y, self.cell_size, out=iy, casting="unsafe")
+        np.clip(ix, 0, self.shape[0] - 1, out=ix)
+        np.clip(iy, 0, self.shape[1] - 1, out=iy)
+        ix *= self.shape[1]
+        ix += iy
+        return np.take(self.labels.reshape(-1), ix, out=b["hits"])
+
+    def take(self, hits: np.ndarray, mask: np.ndarray | None = None):
+        """
+        Pick up one unit of food for every point of ``mask`` on a source.
+
+        When a source holds fewer units than points want, the first points
+        in array order get them.
+
+        Parameters
+        ----------
+        hits : np.ndarray
+            Source ids from ``query``.
+        mask : np.ndarray | None
+            Points that want food; all points when None.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask of the points that got food.
+        """
+        found = hits >= 0
+        if mask is not None:
+            found &= mask
+        if self.quantity is None:
+            return found
+        points = np.flatnonzero(found)
+        if not len(points):
+            return found
+        sources = hits[points].astype(np.intp)
+        order = np.argsort(sources, kind="stable")
+        ordered = sources[order]
+        # rank of every point among the points on the same source
+        rank = np.empty(len(points), dtype=np.intp)
+        rank[order] = np.arange(len(points)) - \
+            np.searchsorted(ordered, ordered)
+        granted = rank < self.quantity[sources]
+        found[points[~granted]] = False
+        self.quantity -= np.bincount(sources[granted],
+                                     minlength=len(self.quantity))
+        for source in np.unique(sources).tolist():
+            if self.quantity[source] <= 0:
+                self._clear(source)
+        return found
+
+    def take_one(self, source: int) -> bool:
+        """
+        Pick up one unit of food from one source.
+
+        Returns
+        -------
+        bool
+            False if ``source`` is ``-1`` or exhausted.
+        """
+        if source < 0:
+            return False
+        if self.quantity is None:
+            return True
+        if self.quantity[source] <= 0:
+            return False
+        self.quantity[source] -= 1
+        if self.quantity[source] == 0:
+            self._clear(source)
+        return True
+
+    def pop_exhausted(self) -> list:
+        """
+        Sources exhausted since the last call, e.g. to redraw them.
+        """
+        exhausted, self.exhausted = self.exhausted, []
+        return exhausted
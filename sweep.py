@@ -0,0 +1,222 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+from config import SimConfig, build_world
+
+# Globals
+# General
+SCREEN = (2000, 1000)
+TICKS = 3000
+WORKERS = os.cpu_count() or 1
+# Default grid, a small neighbourhood of the PyAnts defaults
+ANT_COUNTS = (1_000,)
+TURN_RATES = (0.05, 0.1, 0.2)
+RND_RATES = (0.1, 0.2, 0.4)
+DECAY_RATES = (1, 2, 4)
+SEEDS = (0,)
+# Results table columns after the swept parameters
+METRICS = ("delivered_per_1000", "first_delivery", "ticks_per_second")
+
+
+def parameter_grid(base: SimConfig = SimConfig(), **values) -> list:
+    """
+    Every combination of the given parameter values.
+
+    Parameters
+    ----------
+    base : SimConfig
+        Config supplying all parameters that are not swept.
+    **values
+        One sequence of values per ``SimConfig`` field, e.g.
+        ``ant_turn_rate=(0.1, 0.2)``.
+
+    Returns
+    -------
+    list[SimConfig]
+        One config per combination, the last parameter varying fastest.
+    """
+    names = list(values)
+    return [base.replace(**dict(zip(names, combination)))
+            for combination in itertools.product(*values.values())]
+
+
+def run_config(config: SimConfig, ticks: int = TICKS) -> dict:
+    """
+    Run one headless colony and measure its foraging.
+
+    Parameters
+    ----------
+    config : SimConfig
+        The parameters of the run.
+    ticks : int
+        Number of simulation ticks.
+
+    Returns
+    -------
+    dict
+        ``delivered``, ``delivered_per_1000`` ticks, ``first_delivery`` (the
+        tick food first reached the nest, None if it never did),
+        ``seconds`` and ``ticks_per_second``.
+    """
+    world = build_world(config)
+    colony = world.colony
+    first_delivery = None
+    start = time.perf_counter()
+    for _ in range(ticks):
+        world.step()
+        if first_delivery is None and colony.delivered:
+            first_delivery = world.tick
+    seconds = time.perf_counter() - start
+    return {
+        "delivered": colony.delivered,
+        "delivered_per_1000": colony.delivered * 1000 / ticks,
+        "first_delivery": first_delivery,
+        "seconds": seconds,
+        "ticks_per_second": ticks / seconds if seconds else float("inf"),
+    }
+
+
+def _run(args):
+    return run_config(*args)
+
+
+def sweep(configs: list, ticks: int = TICKS,
+          workers: int = WORKERS) -> list:
+    """
+    Run every config headless in a process pool.
+
+    Runs are independent and seeded by their config, so results do not
+    depend on the number of workers or the order runs finish in. Every
+    worker builds its worlds with ``build_world`` and keeps its interpreter
+    warm across runs.
+
+    Parameters
+    ----------
+    configs : list[SimConfig]
+        The runs, e.g. from ``parameter_grid``.
+    ticks : int
+        Number of simulation ticks per run.
+    workers : int
+        Number of worker processes; 1 runs everything in this process.
+
+    Returns
+    -------
+    list[tuple[SimConfig, dict]]
+        Every config with the metrics of ``run_config``, in input order.
+    """
+    tasks = [(config, ticks) for config in configs]
+    workers = max(1, min(workers, len(tasks)))
+    if workers == 1:
+        return list(zip(configs, map(_run, tasks)))
+    with mp.Pool(workers) as pool:
+        return list(zip(configs, pool.imap(_run, tasks)))
+
+
+def results_table(results: list, parameters) -> list:
+    """
+    Flatten sweep results into one row per run.
+
+    Parameters
+    ----------
+    results : list[tuple[SimConfig, dict]]
+        The output of ``sweep``.
+    parameters : list[str]
+        ``SimConfig`` fields to show, usually the swept ones.
+
+    Returns
+    -------
+    list[dict]
+        The parameters followed by ``METRICS`` for every run.
+    """
+    return [{**{name: getattr(config, name) for name in parameters},
+             **{name: metrics[name] for name in METRICS}}
+            for config, metrics in results]
+
+
+def format_table(rows: list) -> str:
+    """
+    Render rows as an aligned plain-text table.
+    """
+    if not rows:
+        return ""
+
+    def cell(value):
+        if value is None:
+            return "-"
+        return f"{value:.6g}" if isinstance(value, float) else str(value)
+
+    columns = list(rows[0])
+    cells = [columns] + [[cell(row[name]) for name in columns]
+                         for row in rows]
+    widths = [max(len(line[index]) for line in cells)
+              for index in range(len(columns))]
+    return "\n".join("  ".join(text.rjust(width)
+                               for text, width in zip(line, widths))
+                     for line in cells)
+
+
+def export(rows: list, path: str):
+    """
+    Write the results table.
+
+    Parameters
+    ----------
+    rows : list[dict]
+        The output of ``results_table``.
+    path : str
+        Output file; JSON if it ends in ``.json``, CSV otherwise.
+    """
+    with open(path, "w", newline="") as f:
+        if path.endswith(".json"):
+            json.dump(rows, f, indent=2)
+            return
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a grid of headless colonies and compare foraging.")
+    parser.add_argument("--ants", nargs="+", type=int, default=ANT_COUNTS)
+    parser.add_argument("--turn-rate", nargs="+", type=float,
+                        default=TURN_RATES)
+    parser.add_argument("--rnd-rate", nargs="+", type=float,
+                        default=RND_RATES)
+    parser.add_argument("--decay-rate", nargs="+", type=float,
+                        default=DECAY_RATES)
+    parser.add_argument("--seeds", nargs="+", type=int, default=SEEDS,
+                        help="repeat every combination with these seeds")
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--width", type=int, default=SCREEN[0])
+    parser.add_argument("--height", type=int, default=SCREEN[1])
+    parser.add_argument("--obstacles", metavar="PNG",
+                        help="load walls from the bright pixels of an image")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--output", metavar="FILE",
+                        help="also write the table as .csv or .json")
+    args = parser.parse_args()
+
+    values = {
+        "ants_count": args.ants,
+        "ant_turn_rate": args.turn_rate,
+        "ant_rnd_rate": args.rnd_rate,
+        "pheromone_decay_rate": args.decay_rate,
+        "seed": args.seeds,
+    }
+    base = SimConfig(size=(args.width, args.height),
+                     obstacles=args.obstacles)
+    configs = parameter_grid(base, **values)
+    results = sweep(configs, args.ticks, args.workers)
+    rows = results_table(results, list(values))
+    print(format_table(rows))
+    if args.output:
+        export(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pytest
+
+PyAntsArcade = pytest.importorskip("PyAntsArcade")
+
+
+def _ant(nest, trails, x, y, carrying=False):
+    ant = PyAntsArcade.Ant(nest, trails)
+    ant.center_x, ant.center_y = x, y
+    ant.found_food = carrying
+    return ant
+
+
+def _world():
+    nest = PyAntsArcade.Nest()
+    nest.center_x, nest.center_y = 50, 50
+    food = PyAntsArcade.Food()
+    food.center_x, food.center_y = 400, 300
+    return nest, [food], PyAntsArcade.TrailStore()
+
+
+def test_carrying_ant_moves_and_leaves_a_tip():
+    nest, food_list, trails = _world()
+    ant = _ant(nest, trails, 400, 300)
+    PyAntsArcade.update_ants([ant], food_list, nest, PyAntsArcade.TipHash())
+    assert ant.found_food
+    assert ant.tip == (400, 300)
+
+    ant.update()
+    assert (ant.center_x, ant.center_y) != (400, 300)
+    assert ant.tip == (ant.center_x, ant.center_y)
+    assert len(trails) == 1
+
+
+def test_ant_picks_up_food_from_another_ants_tip():
+    nest, food_list, trails = _world()
+    carrier = _ant(nest, trails, 200, 200, carrying=True)
+    carrier.leave_trail(PyAntsArcade.FOUND_FOOD)
+    searcher = _ant(nest, trails, 202, 201)
+    bystander = _ant(nest, trails, 300, 100)
+    tips = PyAntsArcade.TipHash()
+
+    PyAntsArcade.update_ants([carrier, searcher, bystander], food_list,
+                             nest, tips)
+
+    assert len(list(tips.nearby(200, 200))) == 1
+    assert searcher.found_food
+    assert searcher.tip == (202, 201)
+    assert not bystander.found_food
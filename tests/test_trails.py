@@ -0,0 +1,36 @@
+import numpy as np
+
+from trails import TrailBands, TrailStore
+
+
+def _expected(trails, bands, kinds):
+    x, y, kind, strength = trails.points()
+    band = np.minimum((strength * bands).astype(np.intp), bands - 1)
+    return [[list(zip(x[(band == b) & (kind == k)].tolist(),
+                      y[(band == b) & (kind == k)].tolist()))
+             for k in range(kinds)] for b in range(bands)]
+
+
+def _run(capacity, decay_rate, per_tick, ticks=1200):
+    rng = np.random.default_rng(0)
+    trails = TrailStore(capacity, decay_rate)
+    bands = TrailBands(trails, 8, 2)
+    for tick in range(ticks):
+        for _ in range(rng.integers(per_tick + 1)):
+            trails.deposit(rng.uniform(0, 100), rng.uniform(0, 100),
+                           rng.integers(2))
+        trails.advance()
+        if tick % 7 == 0:
+            assert bands.update() == _expected(trails, 8, 2)
+    return trails
+
+
+def test_points_expire_with_age():
+    trails = _run(100_000, 0.01, 30)
+    assert 0 < len(trails) < 30 * trails.lifetime
+    assert trails.points()[3].min() >= trails.decay ** trails.lifetime
+
+
+def test_bands_follow_a_full_ring():
+    trails = _run(500, 0.002, 30)
+    assert len(trails) == 500
@@ -0,0 +1,265 @@
+import math
+import numpy as np
+
+# Globals
+# Trail store settings
+TRAIL_CAPACITY = 1 << 16
+# Upper bound of trail_capacity, about 50 MiB of points
+TRAIL_MAX_CAPACITY = 1 << 22
+# Strength lost per tick, compounded
+TRAIL_DECAY_RATE = 0.0005
+# Points below this strength are expired; one 8-bit colour step
+TRAIL_MIN_STRENGTH = 1 / 255
+
+
+def trail_lifetime(decay_rate: float = TRAIL_DECAY_RATE,
+                   min_strength: float = TRAIL_MIN_STRENGTH) -> float:
+    """
+    Number of ticks a point lives before its strength drops below
+    ``min_strength``; infinite without decay.
+    """
+    if not 0 < decay_rate < 1:
+        return math.inf
+    return math.ceil(math.log(min_strength) / math.log(1 - decay_rate))
+
+
+def trail_capacity(ants_count: int, decay_rate: float = TRAIL_DECAY_RATE,
+                   min_strength: float = TRAIL_MIN_STRENGTH,
+                   limit: int = TRAIL_MAX_CAPACITY) -> int:
+    """
+    Ring size that holds every point until it expires.
+
+    Each ant deposits one point per tick, so that is ``ants_count`` times
+    the lifetime, capped at ``limit``. Past the cap, trails are cut short
+    by the ring overwriting its oldest points; they then span about
+    ``limit / ants_count`` ticks instead of the full lifetime.
+
+    Parameters
+    ----------
+    ants_count : int
+        Number of ants depositing into the store.
+    decay_rate : float
+        Share of its strength a point loses per tick.
+    min_strength : float
+        Strength below which a point is dropped.
+    limit : int
+        Largest capacity to return.
+
+    Returns
+    -------
+    int
+        Capacity for ``TrailStore``.
+    """
+    lifetime = trail_lifetime(decay_rate, min_strength)
+    return int(max(1, min(ants_count * lifetime, limit)))
+
+
+class TrailStore:
+    """
+    Shared ring buffer of trail points, oldest first.
+
+    A point is written once with the tick it was deposited on and never
+    touched again: its strength ``(1 - decay_rate) ** age`` is derived from
+    its age when the trail is drawn or queried. Points are deposited in
+    tick order, so expired points always form the oldest run of the ring
+    and are dropped by moving its tail. When the ring is full, a new point
+    overwrites the oldest one: a ring smaller than the number of points
+    deposited per lifetime truncates trails before they fade. Size it with
+    ``trail_capacity``.
+    """
+
+    def __init__(self, capacity: int = TRAIL_CAPACITY,
+                 decay_rate: float = TRAIL_DECAY_RATE,
+                 min_strength: float = TRAIL_MIN_STRENGTH):
+        """
+        Initialize an empty TrailStore.
+
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of live points.
+        decay_rate : float
+            Share of its strength a point loses per tick.
+        min_strength : float
+            Strength below which a point is dropped.
+        """
+        self.capacity = capacity
+        self.decay = 1 - decay_rate
+        self.lifetime = trail_lifetime(decay_rate, min_strength)
+        self.x = np.empty(capacity, dtype=np.float32)
+        self.y = np.empty(capacity, dtype=np.float32)
+        self.born = np.empty(capacity, dtype=np.int32)
+        self.kind = np.empty(capacity, dtype=np.uint8)
+        self.tick = 0
+        # total points ever deposited and dropped; a point's slot in the
+        # ring is its number modulo the capacity
+        self.head = 0
+        self.tail = 0
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    def deposit(self, x: float, y: float, kind: int = 0):
+        """
+        Add a point at the current tick.
+
+        Parameters
+        ----------
+        x : float
+            The point's x-coordinate.
+        y : float
+            The point's y-coordinate.
+        kind : int
+            Small tag stored with the point, e.g. the mode of the ant that
+            left it.
+        """
+        slot = self.head % self.capacity
+        self.x[slot] = x
+        self.y[slot] = y
+        self.born[slot] = self.tick
+        self.kind[slot] = kind
+        self.head += 1
+        if self.head - self.tail > self.capacity:
+            self.tail += 1
+
+    def advance(self, ticks: int = 1):
+        """
+        Move the clock forward and drop the points that expired.
+        """
+        self.tick += ticks
+        if self.lifetime == math.inf:
+            return
+        self.tail = self.first_since(self.tick - self.lifetime + 1)
+
+    def first_since(self, tick: int) -> int:
+        """
+        Number of the oldest live point deposited at ``tick`` or later.
+
+        Returns ``head`` when there is none. Deposit ticks never decrease
+        along the ring, so this is a binary search.
+        """
+        number = self.tail
+        # a key of the array's own type, or numpy converts the whole run
+        tick = self.born.dtype.type(tick)
+        # the live points are at most two sorted runs of the ring
+        while number < self.head:
+            start = number % self.capacity
+            stop = min(start + self.head - number, self.capacity)
+            before = int(np.searchsorted(self.born[start:stop], tick))
+            number += before
+            if before < stop - start:
+                break
+        return number
+
+    def clear(self):
+        """Drop every point."""
+        self.tail = self.head
+
+    def _slots(self, first: int | None = None,
+               stop: int | None = None) -> np.ndarray:
+        first = self.tail if first is None else first
+        stop = self.head if stop is None else stop
+        return np.arange(first, stop) % self.capacity
+
+    def strength(self, age) -> np.ndarray:
+        """
+        Strength of points of the given age, 1 when fresh.
+        """
+        return np.power(self.decay, age, dtype=np.float32)
+
+    def points(self):
+        """
+        All live points, oldest first.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            The x- and y-coordinates, kinds and strengths of the points.
+        """
+        slots = self._slots()
+        age = self.tick - self.born.take(slots)
+        return (self.x.take(slots), self.y.take(slots),
+                self.kind.take(slots), self.strength(age))
+
+
+class TrailBands:
+    """
+    Live points of a TrailStore as point lists per kind and strength band.
+
+    Band ``b`` of ``bands`` holds the points with a strength in
+    ``[b / bands, (b + 1) / bands)``, the last band also the fresh ones.
+    A band is a fixed range of ages, and points are stored oldest first, so
+    every band is one run of point numbers that only moves forward in
+    time. ``update`` therefore only trims the points that aged out of a
+    band and appends the ones that aged into it; the cost per frame follows
+    the number of points deposited since the last one, not the length of
+    the trails.
+    """
+
+    def __init__(self, trails: TrailStore, bands: int, kinds: int):
+        """
+        Initialize empty TrailBands.
+
+        Parameters
+        ----------
+        trails : TrailStore
+            The store to mirror.
+        bands : int
+            Number of strength bands.
+        kinds : int
+            Number of point kinds; kinds are ``0`` to ``kinds - 1``.
+        """
+        self.trails = trails
+        self.kinds = kinds
+        # oldest age still in band b or a brighter one, from the faintest
+        # band up
+        self.ages = [math.inf] + [
+            math.floor(math.log(band / bands) / math.log(trails.decay))
+            if trails.decay < 1 else math.inf
+            for band in range(1, bands)]
+        self.ranges = [(0, 0)] * bands
+        self._kinds = [np.empty(0, dtype=np.uint8) for _ in range(bands)]
+        self.points = [[[] for _ in range(kinds)] for _ in range(bands)]
+
+    def update(self):
+        """
+        Bring the point lists up to date with the store.
+
+        Returns
+        -------
+        list[list[list[tuple[float, float]]]]
+            ``points[band][kind]``, an ``(x, y)`` tuple per point, oldest
+            first. The lists are kept and changed by later updates.
+        """
+        trails = self.trails
+        bounds = [trails.tail if age == math.inf
+                  else trails.first_since(trails.tick - age)
+                  for age in self.ages] + [trails.head]
+        for band, (first, stop) in enumerate(zip(bounds, bounds[1:])):
+            old_first, old_stop = self.ranges[band]
+            kinds, lists = self._kinds[band], self.points[band]
+            if first >= old_stop:
+                # nothing of the old run is left in the band
+                kinds = kinds[:0]
+                for points in lists:
+                    points.clear()
+                old_stop = first
+            elif first > old_first:
+                gone = np.bincount(kinds[:first - old_first],
+                                   minlength=self.kinds)
+                for points, count in zip(lists, gone.tolist()):
+                    del points[:count]
+                kinds = kinds[first - old_first:]
+            if stop > old_stop:
+                slots = trails._slots(old_stop, stop)
+                new_kinds = trails.kind.take(slots)
+                x, y = trails.x.take(slots), trails.y.take(slots)
+                for kind, points in enumerate(lists):
+                    mask = new_kinds == kind
+                    # tuples of floats drop out of garbage collection, so
+                    # millions of kept points cost the collector nothing
+                    points.extend(zip(x[mask].tolist(), y[mask].tolist()))
+                kinds = np.concatenate((kinds, new_kinds))
+            self._kinds[band] = kinds
+            self.ranges[band] = (first, stop)
+        return self.points